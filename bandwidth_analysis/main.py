@@ -27,6 +27,9 @@ main.py - 帯域制御精度分析ツール 実行エントリポイント
     # 4. グラフ描画のみを実行 (全種類 G1-G4)
     python main.py --graphs --date 2025-01-20 --ids AA00-00-2015
 
+    # 5. ID単位で4プロセス並列にグラフ描画
+    python main.py --graphs --start-date 2025-01-15 --end-date 2025-01-21 --jobs 4
+
 引数詳細:
     --all         : CSV統合、グラフ描画の全工程を順次実行 (サンプル生成は含みません)
     --sample      : data/ ディレクトリにテスト用のCSVファイルを生成
@@ -37,6 +40,8 @@ main.py - 帯域制御精度分析ツール 実行エントリポイント
     --start-date  : 分析開始日 (YYYY-MM-DD)。省略時はデータ最新日
     --end-date    : 分析終了日 (YYYY-MM-DD)。省略時は --start-date と同日
     --ids         : 分析対象とするIDリスト (スペース区切り)。未指定時は有効ID全自動抽出。
+    --jobs        : グラフ描画の並列プロセス数 (デフォルト: 1)。0 で os.cpu_count() (CPUコア数)。
+                    対象ID数を上限とし、負の値はエラー。
 """
 
 
@@ -44,28 +49,78 @@ import argparse
 import logging
 import os
 import sys
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 
 # srcディレクトリをモジュール検索パスに追加
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.config import (
-    DATA_DIR, OUTPUT_DIR,
+    DATA_DIR, OUTPUT_DIR, ensure_dirs, get_filepath,
     DEFAULT_TARGET_DATE,
     DEFAULT_SAMPLE_START_DATE, DEFAULT_SAMPLE_NUM_DAYS,
     DEFAULT_SAMPLE_ISP_LIST, DEFAULT_SAMPLE_POI_CODE, DEFAULT_SAMPLE_SEED,
     MERGED_CSV_FILENAME, NEW_TRAFFIC_FILENAME, CURRENT_TRAFFIC_FILENAME, BANDWIDTH_LIMIT_FILENAME,
 )
-from src.sample_data import generate_sample_data
-from src.merge_csv import merge_traffic_csv
-from src.graphs import (
-    plot_graph1, plot_graph2, plot_graph3, plot_graph4,
-)
+# pandas / matplotlib を読み込む src.sample_data・src.merge_csv・src.graphs は、
+# --help や引数エラー時に読み込み時間を払わないよう、使用する処理の中でインポートする
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 logger = logging.getLogger(__name__)
 
 
+def _non_negative_int(value) -> int:
+    """
+    argparse 用の型変換関数。0 以上の整数だけを受け付ける（--jobs 用）。
+
+    Args:
+        value (str): コマンドライン引数の文字列
+
+    Returns:
+        int: 変換後の整数
+
+    Raises:
+        argparse.ArgumentTypeError: 整数でない、または負の値の場合
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"整数を指定してください: {value}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"0 以上の整数を指定してください: {value}")
+    return number
+
+
+def _render_graphs(df, selected_graphs, target_ids, g12_range, g34_range) -> None:
+    """
+    選択されたグラフを対象IDについて描画する（並列実行時はワーカープロセスで呼ばれる）。
+
+    Args:
+        df (pd.DataFrame): 統合CSV DataFrame（対象IDの行のみでよい）
+        selected_graphs (list[int]): 描画するグラフ番号
+        target_ids (list[str]): 描画対象IDリスト
+        g12_range (tuple[str, str]): G1/G2 の (開始日, 終了日)
+        g34_range (tuple[str, str]): G3/G4 の (開始日, 終了日)
+
+    Returns:
+        None
+    """
+    from src.graphs import plot_graph1, plot_graph2, plot_graph3, plot_graph4
+
+    # グラフ番号 -> (描画関数, 対象期間) の対応表を引き、選択されたグラフだけを番号順に描画する
+    # グラフごとに全対象IDをまとめて渡す（各関数内で期間抽出とID分割を1回だけ行う）
+    graph_table = {
+        1: (plot_graph1, g12_range),
+        2: (plot_graph2, g12_range),
+        3: (plot_graph3, g34_range),
+        4: (plot_graph4, g34_range),
+    }
+    for graph_no in sorted(set(selected_graphs)):
+        plot_func, (start_date, end_date) = graph_table[graph_no]
+        logger.info(f"Plotting Graph {graph_no}: {target_ids}")
+        plot_func(df, start_date=start_date, end_date=end_date,
+                  output_dir=OUTPUT_DIR, target_ids=target_ids)
+
+
 def main() -> None:
     """
     帯域制御精度分析ツールのCLIエントリポイント。
@@ -104,6 +159,9 @@ def main() -> None:
                         help="分析終了日 (YYYY-MM-DD)。省略時は --start-date と同日")
     params.add_argument("--ids", nargs="+", default=None,
                         help="対象IDリスト (未指定時は new_volume_mbps_in が有効な全IDを自動抽出)")
+    params.add_argument("--jobs", type=_non_negative_int, default=1,
+                        help="グラフ描画の並列プロセス数 (デフォルト: 1)。"
+                             "0 で os.cpu_count() (CPUコア数)。負の値は指定不可")
 
     args = parser.parse_args()
 
@@ -111,41 +169,54 @@ def main() -> None:
         parser.print_help()
         sys.exit(0)
 
+    # 入出力ディレクトリの作成はここで一度だけ行う
+    ensure_dirs()
+
     # 1. サンプルデータ生成 (明示的に --sample が指定された時のみ)
     if args.sample:
+        from src.sample_data import generate_sample_data
+
         logger.info("Generating sample data...")
         generate_sample_data(DATA_DIR, DEFAULT_SAMPLE_START_DATE, DEFAULT_SAMPLE_NUM_DAYS,
                              DEFAULT_SAMPLE_ISP_LIST, DEFAULT_SAMPLE_POI_CODE, DEFAULT_SAMPLE_SEED)
 
     # 2. CSV統合
     if args.all or args.merge:
+        from src.merge_csv import merge_traffic_csv
+
         logger.info("Merging CSV files...")
         merge_traffic_csv(
-            os.path.join(DATA_DIR, NEW_TRAFFIC_FILENAME),
-            os.path.join(DATA_DIR, CURRENT_TRAFFIC_FILENAME),
-            os.path.join(DATA_DIR, BANDWIDTH_LIMIT_FILENAME),
-            os.path.join(DATA_DIR, MERGED_CSV_FILENAME),
+            get_filepath(NEW_TRAFFIC_FILENAME),
+            get_filepath(CURRENT_TRAFFIC_FILENAME),
+            get_filepath(BANDWIDTH_LIMIT_FILENAME),
+            get_filepath(MERGED_CSV_FILENAME),
         )
 
     # 3. グラフ描画
     if args.all or args.graphs or args.select:
-        merged_path = os.path.join(DATA_DIR, MERGED_CSV_FILENAME)
+        merged_path = get_filepath(MERGED_CSV_FILENAME)
         if not os.path.exists(merged_path):
             logger.error(f"Error: {merged_path} がありません。先に --merge を実行してください。")
             sys.exit(1)
 
-        df = pd.read_csv(merged_path, parse_dates=["timestamp"])
+        import pandas as pd
+        from src.graphs import GRAPH_COLUMNS, GRAPH_DTYPES, GRAPH_DATE_FORMAT
+
+        # グラフで使用する列のみ、型と日時書式を明示して読み込む（id は category 型）
+        df = pd.read_csv(merged_path, usecols=GRAPH_COLUMNS, dtype=GRAPH_DTYPES,
+                         parse_dates=["timestamp"], date_format=GRAPH_DATE_FORMAT)
 
         # new_volume_mbps_in が常に 0 の ID はグラフ生成対象外
-        all_ids = df["id"].unique()
-        valid_ids = [
-            tid for tid in all_ids
-            if df[df["id"] == tid]["new_volume_mbps_in"].max() > 0
-        ]
+        # ID別の最大値を1回の groupby で求める
+        max_by_id = df.groupby("id", observed=True)["new_volume_mbps_in"].max()
+        valid_ids = max_by_id.index[max_by_id > 0].tolist()
         if args.ids:
-            # ユーザー指定IDのうち有効なものだけ使用
-            target_ids = [tid for tid in args.ids if tid in valid_ids]
-            excluded = [tid for tid in args.ids if tid not in valid_ids]
+            # ユーザー指定IDのうち有効なものだけ使用（判定用に set を1回だけ作り、リストの線形探索を避ける）
+            # 対象と除外は1回の走査で振り分ける
+            valid_id_set = set(valid_ids)
+            target_ids, excluded = [], []
+            for tid in args.ids:
+                (target_ids if tid in valid_id_set else excluded).append(tid)
             if excluded:
                 logger.warning(f"以下のIDは new_volume_mbps_in=0 のためスキップ: {excluded}")
         else:
@@ -174,27 +245,33 @@ def main() -> None:
         # --select があればそれを優先、なければ 1-4 すべて
         selected_graphs = args.select if args.select else [1, 2, 3, 4]
 
-        logger.info("--- Analysis Execution ---")
-        logger.info(f"Selected Graphs : {selected_graphs}")
-        logger.info(f"Target IDs      : {target_ids}")
-        logger.info(f"G1/G2 date range: {g12_start} ~ {g12_end}")
-        logger.info(f"G3/G4 date range: {g34_start} ~ {g34_end}")
-
-        # IDごとのループ（全グラフ共通）
-        for tid in target_ids:
-            logger.info(f"Processing ID: {tid}")
-            if 1 in selected_graphs:
-                plot_graph1(df, start_date=g12_start, end_date=g12_end,
-                            output_dir=OUTPUT_DIR, target_ids=[tid])
-            if 2 in selected_graphs:
-                plot_graph2(df, start_date=g12_start, end_date=g12_end,
-                            output_dir=OUTPUT_DIR, target_ids=[tid])
-            if 3 in selected_graphs:
-                plot_graph3(df, start_date=g34_start, end_date=g34_end,
-                            output_dir=OUTPUT_DIR, target_ids=[tid])
-            if 4 in selected_graphs:
-                plot_graph4(df, start_date=g34_start, end_date=g34_end,
-                            output_dir=OUTPUT_DIR, target_ids=[tid])
+        # 実行条件は1レコードにまとめて出力する（ハンドラのロック取得・flush を1回にする）
+        logger.info("\n".join([
+            "--- Analysis Execution ---",
+            f"Selected Graphs : {selected_graphs}",
+            f"Target IDs      : {target_ids}",
+            f"G1/G2 date range: {g12_start} ~ {g12_end}",
+            f"G3/G4 date range: {g34_start} ~ {g34_end}",
+        ]))
+
+        g12_range = (g12_start, g12_end)
+        g34_range = (g34_start, g34_end)
+        # --jobs 0 は CPUコア数。対象ID数より多いプロセスは起動しない
+        jobs = min(args.jobs or os.cpu_count() or 1, len(target_ids))
+        if jobs <= 1:
+            _render_graphs(df, selected_graphs, target_ids, g12_range, g34_range)
+        else:
+            # IDを各プロセスに振り分け、対象IDの行だけを渡して並列描画する
+            id_chunks = [target_ids[i::jobs] for i in range(jobs)]
+            logger.info(f"Parallel jobs   : {jobs}")
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = [
+                    pool.submit(_render_graphs, df[df["id"].isin(chunk)],
+                                selected_graphs, chunk, g12_range, g34_range)
+                    for chunk in id_chunks
+                ]
+                for future in futures:
+                    future.result()
 
         logger.info(f"\nCompleted. Outputs: {OUTPUT_DIR}")
 
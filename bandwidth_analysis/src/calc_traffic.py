@@ -7,6 +7,8 @@ Byte⇔Mbps変換など、複数モジュールから使用される共通計算
     from src.calc_traffic import bytes_to_mbps, mbps_to_bytes
 """
 
+import numpy as np
+
 
 def bytes_to_mbps(byte_value):
     """
@@ -53,17 +55,25 @@ def calc_error_pct(volume_in_mbps, limit_mbps):
 
     計算式: (volume_in_mbps - limit_mbps) / limit_mbps × 100
 
+    配列を渡した場合は np.divide(where=...) で一括計算し、
+    limit_mbps が0以下の要素はゼロ除算せずにNaNとする。
+
     Args:
-        volume_in_mbps (float): volume_in (Mbps)
-        limit_mbps (float): limit (Mbps)
+        volume_in_mbps (float or array-like): volume_in (Mbps)
+        limit_mbps (float or array-like): limit (Mbps)
 
     Returns:
-        float: 誤差(%)。limit_mbpsが0以下の場合はNaN。
+        float or np.ndarray: 誤差(%)。limit_mbpsが0以下の場合はNaN。
 
     Example:
         >>> calc_error_pct(660, 600)  # limitより10%高い
         10.0
+        >>> calc_error_pct(np.array([660, 500]), np.array([600, 0]))
+        array([10., nan])
     """
-    if limit_mbps <= 0:
-        return float("nan")
-    return (volume_in_mbps - limit_mbps) / limit_mbps * 100
+    volume = np.asarray(volume_in_mbps, dtype=float)
+    limit = np.asarray(limit_mbps, dtype=float)
+    err = np.full(np.broadcast(volume, limit).shape, np.nan)
+    np.divide(volume - limit, limit, out=err, where=limit > 0)
+    err *= 100
+    return err if err.ndim else float(err)
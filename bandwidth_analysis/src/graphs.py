@@ -8,9 +8,11 @@ graphs.py - グラフ描画モジュール
 
 使い方:
     import pandas as pd
+    from src.graphs import GRAPH_COLUMNS, GRAPH_DTYPES, GRAPH_DATE_FORMAT
     from src.graphs import plot_graph1, plot_graph2, plot_graph3, plot_graph4
 
-    df = pd.read_csv("data/merged_traffic.csv", parse_dates=["timestamp"])
+    df = pd.read_csv("data/merged_traffic.csv", usecols=GRAPH_COLUMNS, dtype=GRAPH_DTYPES,
+                     parse_dates=["timestamp"], date_format=GRAPH_DATE_FORMAT)
     plot_graph1(df, start_date="2025-01-15", end_date="2025-01-15", output_dir="output")
 """
 
@@ -26,12 +28,45 @@ import matplotlib.ticker
 from matplotlib.lines import Line2D
 import matplotlib.patches as mpatches
 
+from .calc_traffic import calc_error_pct
+
 
 # ===========================================================================
 # 共通設定
 # ===========================================================================
 plt.rcParams["font.size"] = 10
 plt.rcParams["figure.dpi"] = 100
+# 折れ線の描画高速化: 見た目に影響しない頂点を間引き、長いパスは分割して描画する
+plt.rcParams["path.simplify"] = True
+plt.rcParams["path.simplify_threshold"] = 1.0
+plt.rcParams["agg.path.chunksize"] = 10000
+
+# PNG 保存時の zlib 圧縮レベル (Pillow の既定値 6 より低くし、保存時間を短縮する)
+PNG_COMPRESS_LEVEL = 1
+
+# グラフ描画で参照する統合CSVの列（read_csv の usecols に渡して読み込み量を削減する）
+GRAPH_COLUMNS = [
+    "timestamp", "id",
+    "limit_mbps_in",
+    "new_volume_mbps_in", "new_dropped_mbps_in", "new_dropped_packets_in",
+    "cur_volume_mbps_in",
+]
+
+# 読み込み時の列型指定（型推論を省き、パーサーが最終的な型で直接書き込む）
+# id は category 型にし、ID一致判定を文字列比較ではなく整数コード比較にする
+# 数値列は float32 とし、マスク・集計・描画時のメモリ転送量を半分にする
+# (Mbps / パケット数の値域と有効桁は float32 で十分に収まる)
+GRAPH_DTYPES = {
+    "id": "category",
+    "limit_mbps_in": "float32",
+    "new_volume_mbps_in": "float32",
+    "new_dropped_mbps_in": "float32",
+    "new_dropped_packets_in": "float32",
+    "cur_volume_mbps_in": "float32",
+}
+
+# 統合CSVの timestamp 書式（明示して日時書式の推論を省く）
+GRAPH_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 # ===========================================================================
 # グラフタイトル・凡例ラベル定数
@@ -67,32 +102,132 @@ G4_LABEL_Y         = "Accuracy Error (%)"
 G4_LABEL_CBAR      = "Time of Day"
 G4_LABEL_THRESHOLD = "±10% Threshold"
 
+# 点数がこの値を超える場合、散布図を2次元ヒストグラムのラスタ画像で描画する
+G4_RASTER_THRESHOLD = 5000
+G4_RASTER_BINS = (400, 200)
+
 
 # ===========================================================================
 # 内部ヘルパー関数
 # ===========================================================================
 
-def _filter_day(df: pd.DataFrame, target_id: str, target_date: str) -> pd.DataFrame:
+def _save_figure(fig, fpath: str) -> None:
     """
-    DataFrameから指定IDと指定日の 00:00:00 以上、翌日の 00:00:00 未満を抽出する（内部ヘルパー）。
+    図を PNG として保存する（内部ヘルパー）。
+
+    圧縮レベルを PNG_COMPRESS_LEVEL に下げ、エンコード時間を短縮する。
+
+    Args:
+        fig (matplotlib.figure.Figure): 保存する図
+        fpath (str): 出力ファイルパス
+    """
+    fig.savefig(fpath, bbox_inches="tight",
+                pil_kwargs={"compress_level": PNG_COMPRESS_LEVEL})
+
+
+def _all_ids(df: pd.DataFrame) -> list[str]:
+    """
+    DataFrame に含まれるIDの一覧を返す（内部ヘルパー）。
+
+    id 列が category 型の場合は全行を走査せず、カテゴリ一覧をそのまま返す。
+    該当行の無いIDが含まれることがあるが、各グラフ関数では描画対象外として読み飛ばされる。
 
     Args:
         df (pd.DataFrame): 統合CSV DataFrame
-        target_id (str): 対象ID (例: "AA00-00-2015")
-        target_date (str): 対象日 (YYYY-MM-DD)
 
     Returns:
-        pd.DataFrame: フィルタ済みコピー。データ無しの場合は空DataFrame。
+        list[str]: IDのリスト
+    """
+    ids = df["id"]
+    if isinstance(ids.dtype, pd.CategoricalDtype):
+        return list(ids.cat.categories)
+    return list(ids.unique())
+
+
+def _date_range_mask(ts: pd.Series, start_date: str, end_date: str) -> np.ndarray:
+    """
+    start_date の 00:00:00 以上、end_date 翌日の 00:00:00 未満の行を示すマスクを返す（内部ヘルパー）。
+
+    dt.date で各行を Python の date オブジェクトに変換せず、
+    datetime64 列の int64 表現と整数の境界値を直接比較する。
+
+    Args:
+        ts (pd.Series): datetime64 型の timestamp 列
+        start_date (str): 開始日 (YYYY-MM-DD)
+        end_date (str): 終了日 (YYYY-MM-DD)
+
+    Returns:
+        np.ndarray: ブール配列のマスク
     """
-    start_ts = pd.Timestamp(target_date)
-    next_day_ts = start_ts + pd.Timedelta(days=1)
+    values = ts.to_numpy()
+    lo = pd.Timestamp(start_date).normalize().to_datetime64()
+    hi = (pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1)).to_datetime64()
+    i8 = values.view("i8")
+    return (i8 >= lo.astype(values.dtype).astype("i8")) & (i8 < hi.astype(values.dtype).astype("i8"))
 
-    mask = (
-        (df["id"] == target_id)
-        & (df["timestamp"] >= start_ts)
-        & (df["timestamp"] < next_day_ts)
+
+def _split_by_id(df: pd.DataFrame, mask: pd.Series | np.ndarray) -> dict[str, pd.DataFrame]:
+    """
+    mask で絞り込んだ DataFrame を1回の groupby でID別に分割する（内部ヘルパー）。
+
+    IDごとに全行を走査して一致判定を繰り返す代わりに、絞り込みと分割を
+    それぞれ1パスで行う。
+
+    Args:
+        df (pd.DataFrame): 統合CSV DataFrame
+        mask (pd.Series | np.ndarray): 対象行を示すブールマスク
+
+    Returns:
+        dict[str, pd.DataFrame]: ID をキー、該当行の DataFrame を値とする辞書。
+            該当行が無いIDはキーに含まれない。
+    """
+    grouped = df[mask].groupby("id", sort=False, observed=True)
+    return {tid: d for tid, d in grouped}
+
+
+def _draw_time_raster(ax, x: np.ndarray, y: np.ndarray, time_norm: np.ndarray):
+    """
+    散布図の代わりに、2次元ヒストグラムのビンごとの平均時刻を画像として描画する（内部ヘルパー）。
+
+    点数に依存せず1枚の画像で描画するため、大量の点を持つ散布図より高速に描画・保存できる。
+    データの無いビンは NaN（透明）とする。
+
+    Args:
+        ax (matplotlib.axes.Axes): 描画先の Axes
+        x (np.ndarray): X軸の値
+        y (np.ndarray): Y軸の値
+        time_norm (np.ndarray): 0〜1に正規化した時刻（色に使用）
+
+    Returns:
+        matplotlib.image.AxesImage: カラーバー作成用の画像オブジェクト
+    """
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=G4_RASTER_BINS)
+    time_sum, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges], weights=time_norm)
+    mean_time = np.full_like(time_sum, np.nan)
+    np.divide(time_sum, counts, out=mean_time, where=counts > 0)
+    return ax.imshow(
+        mean_time.T,
+        origin="lower",
+        extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]),
+        aspect="auto",
+        interpolation="nearest",
+        cmap="turbo",
+        vmin=0, vmax=1,
     )
-    return df[mask].copy()
+
+
+def _filter_day(df: pd.DataFrame, target_date: str) -> pd.DataFrame:
+    """
+    DataFrameから指定日の 00:00:00 以上、翌日の 00:00:00 未満を抽出する（内部ヘルパー）。
+
+    Args:
+        df (pd.DataFrame): 単一IDに絞り込み済みの DataFrame
+        target_date (str): 対象日 (YYYY-MM-DD)
+
+    Returns:
+        pd.DataFrame: フィルタ結果（描画で読み取るだけなのでコピーはしない）。データ無しの場合は空DataFrame。
+    """
+    return df[_date_range_mask(df["timestamp"], target_date, target_date)]
 
 
 # ===========================================================================
@@ -128,70 +263,83 @@ def plot_graph1(
         list[str]: 保存したファイルパスのリスト
     """
     if target_ids is None:
-        target_ids = df["id"].unique()
+        target_ids = _all_ids(df)
 
     os.makedirs(output_dir, exist_ok=True)
+    # 出力パスの固定部分はループの外で1回だけ組み立てる
+    out_prefix = os.path.join(output_dir, "graph1_")
     saved = []
 
-    for date in pd.date_range(start_date, end_date):
-        date_str = date.strftime("%Y-%m-%d")
-
-        for tid in target_ids:
-            d = _filter_day(df, tid, date_str)
-            if len(d) == 0:
-                continue
-
-            start_ts = pd.Timestamp(f"{date_str} 00:00:00")
-            end_ts = pd.Timestamp(f"{date_str} 23:55:00")
-
-            fig, ax1 = plt.subplots(figsize=(16, 7))
-
-            # limit ±10% 塗りつぶし
-            ax1.fill_between(
-                d["timestamp"], d["limit_mbps_in"] * 0.9, d["limit_mbps_in"] * 1.1,
-                color="orange", alpha=0.15, label=G1_LABEL_LIMIT_RANGE,
-            )
-
-            # drop_packets (右Y軸)
-            ax2 = ax1.twinx()
-            ax2.bar(d["timestamp"], d["new_dropped_packets_in"],
-                    width=0.003, alpha=0.3, color="red", label=G1_LABEL_DROP_PKT, zorder=1)
-            ax2.set_ylabel("drop_packets (pkt)", color="red")
-            ax2.tick_params(axis="y", labelcolor="red")
-            # 指数表記(1e6など)をオフにし、カンマ区切り表記
-            ax2.get_yaxis().get_major_formatter().set_scientific(False)
-            ax2.get_yaxis().set_major_formatter(matplotlib.ticker.StrMethodFormatter('{x:,.0f}'))
-
-            # volume_in 折れ線
-            ax1.plot(d["timestamp"], d["new_volume_mbps_in"],
-                     color="blue", linewidth=1.2, label=G1_LABEL_NEW_IN, zorder=3)
-            ax1.plot(d["timestamp"], d["cur_volume_mbps_in"],
-                     color="green", linewidth=1.2, linestyle="--", label=G1_LABEL_CUR_IN, zorder=3)
-
-            # limit 折れ線
-            ax1.plot(d["timestamp"], d["limit_mbps_in"],
-                     color="orange", linewidth=2, label=G1_LABEL_LIMIT, zorder=4)
-
-            ax1.set_xlabel("Time")
-            ax1.set_ylabel("Throughput (Mbps)")
-            ax1.set_title(G1_TITLE.format(tid=tid, date=date_str))
-            ax1.set_ylim(bottom=0)
-            ax1.set_xlim(start_ts, end_ts)
-            ax1.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M"))
-            ax1.xaxis.set_major_locator(mdates.HourLocator(interval=1))
-            plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, fontsize=8)
-            ax1.grid(True, alpha=0.3, linestyle="--")
-
-            h1, l1 = ax1.get_legend_handles_labels()
-            h2, l2 = ax2.get_legend_handles_labels()
-            ax1.legend(h1 + h2, l1 + l2, loc="upper left", fontsize=8)
-
-            plt.tight_layout()
-            fname = f"graph1_{tid}_{date_str}.png"
-            fpath = os.path.join(output_dir, fname)
-            fig.savefig(fpath, bbox_inches="tight")
-            plt.close(fig)
-            saved.append(fpath)
+    # 期間内の行を1回で抽出し、ID別に分割しておく
+    by_id = _split_by_id(df, _date_range_mask(df["timestamp"], start_date, end_date))
+
+    # 1枚の Figure を使い回し、ループごとの生成・破棄を避ける
+    fig = plt.figure(figsize=(16, 7))
+    try:
+        for date in pd.date_range(start_date, end_date):
+            date_str = date.strftime("%Y-%m-%d")
+
+            for tid in target_ids:
+                if tid not in by_id:
+                    continue
+                d = _filter_day(by_id[tid], date_str)
+                if len(d) == 0:
+                    continue
+
+                start_ts = pd.Timestamp(f"{date_str} 00:00:00")
+                end_ts = pd.Timestamp(f"{date_str} 23:55:00")
+
+                fig.clf()
+                ax1 = fig.add_subplot()
+
+                # limit ±10% 塗りつぶし
+                ax1.fill_between(
+                    d["timestamp"], d["limit_mbps_in"] * 0.9, d["limit_mbps_in"] * 1.1,
+                    color="orange", alpha=0.15, label=G1_LABEL_LIMIT_RANGE,
+                )
+
+                # drop_packets (右Y軸)
+                # 棒グラフの X 座標は日付数値に一括変換して渡す
+                x_num = mdates.date2num(d["timestamp"].to_numpy())
+                ax2 = ax1.twinx()
+                ax2.bar(x_num, d["new_dropped_packets_in"].to_numpy(),
+                        width=0.003, alpha=0.3, color="red", label=G1_LABEL_DROP_PKT, zorder=1)
+                ax2.set_ylabel("drop_packets (pkt)", color="red")
+                ax2.tick_params(axis="y", labelcolor="red")
+                # 指数表記(1e6など)をオフにし、カンマ区切り表記
+                ax2.get_yaxis().get_major_formatter().set_scientific(False)
+                ax2.get_yaxis().set_major_formatter(matplotlib.ticker.StrMethodFormatter('{x:,.0f}'))
+
+                # volume_in 折れ線
+                ax1.plot(d["timestamp"], d["new_volume_mbps_in"],
+                         color="blue", linewidth=1.2, label=G1_LABEL_NEW_IN, zorder=3)
+                ax1.plot(d["timestamp"], d["cur_volume_mbps_in"],
+                         color="green", linewidth=1.2, linestyle="--", label=G1_LABEL_CUR_IN, zorder=3)
+
+                # limit 折れ線
+                ax1.plot(d["timestamp"], d["limit_mbps_in"],
+                         color="orange", linewidth=2, label=G1_LABEL_LIMIT, zorder=4)
+
+                ax1.set_xlabel("Time")
+                ax1.set_ylabel("Throughput (Mbps)")
+                ax1.set_title(G1_TITLE.format(tid=tid, date=date_str))
+                ax1.set_ylim(bottom=0)
+                ax1.set_xlim(start_ts, end_ts)
+                ax1.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M"))
+                ax1.xaxis.set_major_locator(mdates.HourLocator(interval=1))
+                plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, fontsize=8)
+                ax1.grid(True, alpha=0.3, linestyle="--")
+
+                h1, l1 = ax1.get_legend_handles_labels()
+                h2, l2 = ax2.get_legend_handles_labels()
+                ax1.legend(h1 + h2, l1 + l2, loc="upper left", fontsize=8)
+
+                fig.tight_layout()
+                fpath = f"{out_prefix}{tid}_{date_str}.png"
+                _save_figure(fig, fpath)
+                saved.append(fpath)
+    finally:
+        plt.close(fig)
 
     return saved
 
@@ -228,57 +376,71 @@ def plot_graph2(
         list[str]: 保存したファイルパスのリスト
     """
     if target_ids is None:
-        target_ids = df["id"].unique()
+        target_ids = _all_ids(df)
 
     os.makedirs(output_dir, exist_ok=True)
+    # 出力パスの固定部分はループの外で1回だけ組み立てる
+    out_prefix = os.path.join(output_dir, "graph2_")
     saved = []
 
-    for date in pd.date_range(start_date, end_date):
-        date_str = date.strftime("%Y-%m-%d")
-
-        for tid in target_ids:
-            d = _filter_day(df, tid, date_str)
-            if len(d) == 0:
-                continue
-
-            start_ts = pd.Timestamp(f"{date_str} 00:00:00")
-            end_ts = pd.Timestamp(f"{date_str} 23:55:00")
-
-            fig, ax = plt.subplots(figsize=(16, 7))
-
-            # limit ±10% 塗りつぶし
-            ax.fill_between(
-                d["timestamp"], d["limit_mbps_in"] * 0.9, d["limit_mbps_in"] * 1.1,
-                color="orange", alpha=0.15, label=G2_LABEL_LIMIT_RANGE,
-            )
-
-            # 積み上げ棒グラフ
-            ax.bar(d["timestamp"], d["new_volume_mbps_in"],
-                   width=0.003, color="steelblue", alpha=0.7, label=G2_LABEL_VOL_IN)
-            ax.bar(d["timestamp"], d["new_dropped_mbps_in"],
-                   width=0.003, bottom=d["new_volume_mbps_in"],
-                   color="salmon", alpha=0.7, label=G2_LABEL_DROP_MBPS)
-
-            # limit 折れ線
-            ax.plot(d["timestamp"], d["limit_mbps_in"],
-                    color="orange", linewidth=2, label=G2_LABEL_LIMIT, zorder=5)
-
-            ax.set_xlabel("Time")
-            ax.set_ylabel("Throughput (Mbps)")
-            ax.set_title(G2_TITLE.format(tid=tid, date=date_str))
-            ax.set_xlim(start_ts, end_ts)
-            ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M"))
-            ax.xaxis.set_major_locator(mdates.HourLocator(interval=1))
-            plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, fontsize=8)
-            ax.legend(loc="upper left", fontsize=9)
-            ax.grid(True, alpha=0.3, linestyle="--")
-
-            plt.tight_layout()
-            fname = f"graph2_{tid}_{date_str}.png"
-            fpath = os.path.join(output_dir, fname)
-            fig.savefig(fpath, bbox_inches="tight")
-            plt.close(fig)
-            saved.append(fpath)
+    # 期間内の行を1回で抽出し、ID別に分割しておく
+    by_id = _split_by_id(df, _date_range_mask(df["timestamp"], start_date, end_date))
+
+    # 1枚の Figure を使い回し、ループごとの生成・破棄を避ける
+    fig = plt.figure(figsize=(16, 7))
+    try:
+        for date in pd.date_range(start_date, end_date):
+            date_str = date.strftime("%Y-%m-%d")
+
+            for tid in target_ids:
+                if tid not in by_id:
+                    continue
+                d = _filter_day(by_id[tid], date_str)
+                if len(d) == 0:
+                    continue
+
+                start_ts = pd.Timestamp(f"{date_str} 00:00:00")
+                end_ts = pd.Timestamp(f"{date_str} 23:55:00")
+
+                fig.clf()
+                ax = fig.add_subplot()
+
+                # limit ±10% 塗りつぶし
+                ax.fill_between(
+                    d["timestamp"], d["limit_mbps_in"] * 0.9, d["limit_mbps_in"] * 1.1,
+                    color="orange", alpha=0.15, label=G2_LABEL_LIMIT_RANGE,
+                )
+
+                # 積み上げ棒グラフ
+                # X 座標は日付数値に一括変換し、2 系列で共用する
+                x_num = mdates.date2num(d["timestamp"].to_numpy())
+                vol_in = d["new_volume_mbps_in"].to_numpy()
+                ax.bar(x_num, vol_in,
+                       width=0.003, color="steelblue", alpha=0.7, label=G2_LABEL_VOL_IN)
+                ax.bar(x_num, d["new_dropped_mbps_in"].to_numpy(),
+                       width=0.003, bottom=vol_in,
+                       color="salmon", alpha=0.7, label=G2_LABEL_DROP_MBPS)
+
+                # limit 折れ線
+                ax.plot(d["timestamp"], d["limit_mbps_in"],
+                        color="orange", linewidth=2, label=G2_LABEL_LIMIT, zorder=5)
+
+                ax.set_xlabel("Time")
+                ax.set_ylabel("Throughput (Mbps)")
+                ax.set_title(G2_TITLE.format(tid=tid, date=date_str))
+                ax.set_xlim(start_ts, end_ts)
+                ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M"))
+                ax.xaxis.set_major_locator(mdates.HourLocator(interval=1))
+                plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, fontsize=8)
+                ax.legend(loc="upper left", fontsize=9)
+                ax.grid(True, alpha=0.3, linestyle="--")
+
+                fig.tight_layout()
+                fpath = f"{out_prefix}{tid}_{date_str}.png"
+                _save_figure(fig, fpath)
+                saved.append(fpath)
+    finally:
+        plt.close(fig)
 
     return saved
 
@@ -319,116 +481,121 @@ def plot_graph3(
         list[str]: 保存したファイルパスのリスト。データが存在しないIDはリストに含まれない。
     """
     if target_ids is None:
-        target_ids = df["id"].unique()
+        target_ids = _all_ids(df)
 
     os.makedirs(output_dir, exist_ok=True)
+    # 出力パスの固定部分はループの外で1回だけ組み立てる
+    out_prefix = os.path.join(output_dir, "graph3_boxplot_")
+    out_suffix = f"_{start_date}_{end_date}.png"
     saved = []
 
-    start_d = pd.Timestamp(start_date).date()
-    end_d = pd.Timestamp(end_date).date()
-
-    for tid in target_ids:
-        # 期間フィルタ + ドロップ発生行のみ抽出
-        d = df[
-            (df["id"] == tid)
-            & (df["timestamp"].dt.date >= start_d)
-            & (df["timestamp"].dt.date <= end_d)
-            & (df["new_dropped_packets_in"] > 0)
-        ].copy()
-
-        if len(d) == 0:
-            continue
-
-        # limit=0 を NaN に置換してゼロ除算を回避
-        safe_limit = d["limit_mbps_in"].replace(0, np.nan)
-
-        new_err = ((d["new_volume_mbps_in"] - safe_limit) / safe_limit * 100).dropna().values
-        cur_err = ((d["cur_volume_mbps_in"] - safe_limit) / safe_limit * 100).dropna().values
-
-        # 両系列ともデータが空の場合はスキップ
-        if len(new_err) == 0 and len(cur_err) == 0:
-            continue
-
-        fig, ax = plt.subplots(figsize=(8, 7))
-
-        labels = [G3_LABEL_NEW_ERR, G3_LABEL_CUR_ERR]
-        data = [new_err, cur_err]
-        colors = ["lightblue", "lightgreen"]
-
-        # 箱ひげ図の描画
-        bp = ax.boxplot(
-            data,
-            tick_labels=labels,
-            patch_artist=True,
-            medianprops=dict(color="red", linewidth=2),
-            whiskerprops=dict(linewidth=1.2),
-            flierprops=dict(marker="o", markersize=4, alpha=0.5, markerfacecolor="gray"),
-        )
-        for patch, color in zip(bp["boxes"], colors):
-            patch.set(facecolor=color, alpha=0.7)
-
-        # 基準線の描画
-        ax.axhline(y=0, color="orange", linestyle="--", linewidth=1)
-        ax.axhline(y=10,  color="red", linestyle=":", linewidth=2.0, alpha=0.5)
-        ax.axhline(y=-10, color="red", linestyle=":", linewidth=2.0, alpha=0.5)
-
-        # 数値ラベルとn数の表示
-        for i, vals in enumerate(data):
-            if len(vals) == 0:
+    # 期間フィルタ + ドロップ発生行の抽出を1回で行い、ID別に分割する
+    in_range = _date_range_mask(df["timestamp"], start_date, end_date)
+    by_id = _split_by_id(df, in_range & (df["new_dropped_packets_in"].to_numpy() > 0))
+
+    # 1枚の Figure を使い回し、ループごとの生成・破棄を避ける
+    fig = plt.figure(figsize=(8, 7))
+    try:
+        for tid in target_ids:
+            d = by_id.get(tid)
+            if d is None:
                 continue
-            q1, med, q3 = np.percentile(vals, [25, 50, 75])
-            iqr = q3 - q1
-            wl = np.min(vals[vals >= q1 - 1.5 * iqr]) if any(vals >= q1 - 1.5 * iqr) else np.min(vals)
-            wh = np.max(vals[vals <= q3 + 1.5 * iqr]) if any(vals <= q3 + 1.5 * iqr) else np.max(vals)
-
-            x = i + 1
-            off = 0.35
-            fs = 8
-
-            # 統計数値ラベル（小数第1位に丸め）
-            ax.text(x + off, med, f"Med: {med:.1f}%", va="center", ha="left", fontsize=fs, color="red", fontweight="bold")
-            ax.text(x + off, q3,  f"Q3:  {q3:.1f}%",  va="bottom", ha="left", fontsize=fs, color="gray")
-            ax.text(x + off, q1,  f"Q1:  {q1:.1f}%",  va="top",    ha="left", fontsize=fs, color="gray")
-            ax.text(x + off, wh,  f"Max: {wh:.1f}%",  va="bottom", ha="left", fontsize=fs, color="gray")
-            ax.text(x + off, wl,  f"Min: {wl:.1f}%",  va="top",    ha="left", fontsize=fs, color="gray")
-
-            # n数（サンプル数）の表示 - グラフ下部に青字太字で配置
-            ax.text(x, ax.get_ylim()[0], f"n={len(vals)}",
-                    va="bottom", ha="center", fontsize=9, color="blue", fontweight="bold")
-
-        # カスタム凡例の作成
-        custom_elements = [
-            Line2D([0], [0], color="red", lw=2, label="Median (Actual)"),
-            mpatches.Patch(facecolor="lightblue",  alpha=0.7, label=f"New Device IQR (Q1-Q3)"),
-            mpatches.Patch(facecolor="lightgreen", alpha=0.7, label=f"Current Device IQR (Q1-Q3)"),
-            Line2D([0], [0], color="orange", lw=1, ls="--", label="Target Limit (0%)"),
-            Line2D([0], [0], color="red", lw=1, ls=":", alpha=0.5, label="±10% Threshold"),
-            Line2D([0], [0], marker="o", color="w", markerfacecolor="gray", markersize=6, label="Outliers"),
-            Line2D([0], [0], color="blue", marker="None", ls="None", label="n = Sample Count (Drop detected)"),
-        ]
-        # 凡例はグラフ下部に配置し、統計ラベルとの重なりを回避する
-        # bbox_inches="tight" (savefig) により axes 外の凡例も PNG に含まれる
-        ax.legend(
-            handles=custom_elements,
-            loc="upper center",
-            bbox_to_anchor=(0.5, -0.12),
-            fontsize=9,
-            frameon=True,
-            shadow=True,
-            ncol=2,
-        )
-
-        ax.set_xlabel(G3_XLABEL)
-        ax.set_ylabel(G3_YLABEL)
-        ax.set_title(G3_TITLE.format(tid=tid, start=start_date, end=end_date))
-        ax.grid(axis="y", alpha=0.3)
-
-        plt.tight_layout()
-        fname = f"graph3_boxplot_{tid}_{start_date}_{end_date}.png"
-        fpath = os.path.join(output_dir, fname)
-        fig.savefig(fpath, bbox_inches="tight")
+
+            # limit<=0 の行は NaN となるため除外する
+            limit = d["limit_mbps_in"].to_numpy()
+            new_err = calc_error_pct(d["new_volume_mbps_in"].to_numpy(), limit)
+            cur_err = calc_error_pct(d["cur_volume_mbps_in"].to_numpy(), limit)
+            new_err = new_err[~np.isnan(new_err)]
+            cur_err = cur_err[~np.isnan(cur_err)]
+
+            # 両系列ともデータが空の場合はスキップ
+            if len(new_err) == 0 and len(cur_err) == 0:
+                continue
+
+            fig.clf()
+            ax = fig.add_subplot()
+
+            labels = [G3_LABEL_NEW_ERR, G3_LABEL_CUR_ERR]
+            data = [new_err, cur_err]
+            colors = ["lightblue", "lightgreen"]
+
+            # 箱ひげ図の描画
+            bp = ax.boxplot(
+                data,
+                tick_labels=labels,
+                patch_artist=True,
+                medianprops=dict(color="red", linewidth=2),
+                whiskerprops=dict(linewidth=1.2),
+                flierprops=dict(marker="o", markersize=4, alpha=0.5, markerfacecolor="gray"),
+            )
+            for patch, color in zip(bp["boxes"], colors):
+                patch.set(facecolor=color, alpha=0.7)
+
+            # 基準線の描画
+            ax.axhline(y=0, color="orange", linestyle="--", linewidth=1)
+            ax.axhline(y=10,  color="red", linestyle=":", linewidth=2.0, alpha=0.5)
+            ax.axhline(y=-10, color="red", linestyle=":", linewidth=2.0, alpha=0.5)
+
+            # 数値ラベルとn数の表示
+            for i, vals in enumerate(data):
+                if len(vals) == 0:
+                    continue
+                q1, med, q3 = np.percentile(vals, [25, 50, 75])
+                iqr = q3 - q1
+                # ひげ端の判定マスクは1回だけ作り、判定も NumPy で行う（Python の any() で要素を走査しない）
+                lo_mask = vals >= q1 - 1.5 * iqr
+                hi_mask = vals <= q3 + 1.5 * iqr
+                wl = vals[lo_mask].min() if lo_mask.any() else vals.min()
+                wh = vals[hi_mask].max() if hi_mask.any() else vals.max()
+
+                x = i + 1
+                off = 0.35
+                fs = 8
+
+                # 統計数値ラベル（小数第1位に丸め）
+                ax.text(x + off, med, f"Med: {med:.1f}%", va="center", ha="left", fontsize=fs, color="red", fontweight="bold")
+                ax.text(x + off, q3,  f"Q3:  {q3:.1f}%",  va="bottom", ha="left", fontsize=fs, color="gray")
+                ax.text(x + off, q1,  f"Q1:  {q1:.1f}%",  va="top",    ha="left", fontsize=fs, color="gray")
+                ax.text(x + off, wh,  f"Max: {wh:.1f}%",  va="bottom", ha="left", fontsize=fs, color="gray")
+                ax.text(x + off, wl,  f"Min: {wl:.1f}%",  va="top",    ha="left", fontsize=fs, color="gray")
+
+                # n数（サンプル数）の表示 - グラフ下部に青字太字で配置
+                ax.text(x, ax.get_ylim()[0], f"n={len(vals)}",
+                        va="bottom", ha="center", fontsize=9, color="blue", fontweight="bold")
+
+            # カスタム凡例の作成
+            custom_elements = [
+                Line2D([0], [0], color="red", lw=2, label="Median (Actual)"),
+                mpatches.Patch(facecolor="lightblue",  alpha=0.7, label=f"New Device IQR (Q1-Q3)"),
+                mpatches.Patch(facecolor="lightgreen", alpha=0.7, label=f"Current Device IQR (Q1-Q3)"),
+                Line2D([0], [0], color="orange", lw=1, ls="--", label="Target Limit (0%)"),
+                Line2D([0], [0], color="red", lw=1, ls=":", alpha=0.5, label="±10% Threshold"),
+                Line2D([0], [0], marker="o", color="w", markerfacecolor="gray", markersize=6, label="Outliers"),
+                Line2D([0], [0], color="blue", marker="None", ls="None", label="n = Sample Count (Drop detected)"),
+            ]
+            # 凡例はグラフ下部に配置し、統計ラベルとの重なりを回避する
+            # bbox_inches="tight" (savefig) により axes 外の凡例も PNG に含まれる
+            ax.legend(
+                handles=custom_elements,
+                loc="upper center",
+                bbox_to_anchor=(0.5, -0.12),
+                fontsize=9,
+                frameon=True,
+                shadow=True,
+                ncol=2,
+            )
+
+            ax.set_xlabel(G3_XLABEL)
+            ax.set_ylabel(G3_YLABEL)
+            ax.set_title(G3_TITLE.format(tid=tid, start=start_date, end=end_date))
+            ax.grid(axis="y", alpha=0.3)
+
+            fig.tight_layout()
+            fpath = f"{out_prefix}{tid}{out_suffix}"
+            _save_figure(fig, fpath)
+            saved.append(fpath)
+    finally:
         plt.close(fig)
-        saved.append(fpath)
 
     return saved
 
@@ -452,6 +619,8 @@ def plot_graph4(
       - Y軸: 誤差(%), new_dropped_packets_in > 0 のみ
       - 色: 時刻 (00:00〜23:55 固定カラーマップ)
       - 期間内の全データをプロット
+      - 点数が G4_RASTER_THRESHOLD を超える場合は、ビンごとの平均時刻で色付けした
+        2次元ヒストグラム画像として描画する
 
     Args:
         df (pd.DataFrame): 統合CSV DataFrame
@@ -466,85 +635,90 @@ def plot_graph4(
                    データが存在しないIDについてはリストに含まれない。
     """
     if target_ids is None:
-        target_ids = df["id"].unique()
+        target_ids = _all_ids(df)
 
     os.makedirs(output_dir, exist_ok=True)
+    # 出力パスの固定部分はループの外で1回だけ組み立てる
+    out_prefix = os.path.join(output_dir, "graph4_scatter_")
     saved = []
 
-    start_d = pd.Timestamp(start_date).date()
-    end_d = pd.Timestamp(end_date).date()
-
-    for tid in target_ids:
-        # 期間でフィルタリング
-        d = df[
-            (df["id"] == tid)
-            & (df["timestamp"].dt.date >= start_d)
-            & (df["timestamp"].dt.date <= end_d)
-        ].copy()
-
-        # 制限が発動（ドロップ発生）しているデータのみ抽出
-        d_drop = d[d["new_dropped_packets_in"] > 0].copy()
-        if len(d_drop) == 0:
-            continue
-
-        # limit=0 を NaN に置換してゼロ除算を回避
-        safe_limit = d_drop["limit_mbps_in"].replace(0, np.nan)
-        d_drop["error_pct"] = (
-            (d_drop["new_volume_mbps_in"] - safe_limit) / safe_limit * 100
-        )
-        # NaN 行を除外
-        d_drop = d_drop.dropna(subset=["error_pct"])
-        if len(d_drop) == 0:
-            continue
-
-        # 時刻を0〜1に正規化（色の指定用: 00:00=0, 23:55=1）
-        d_drop["time_norm"] = (
-            d_drop["timestamp"].dt.hour * 60 + d_drop["timestamp"].dt.minute
-        ) / (24 * 60)
-
-        fig, ax = plt.subplots(figsize=(12, 7))
-
-        # 散布図の描画（複数日分が重なるため alpha=0.5 で透過）
-        scatter = ax.scatter(
-            d_drop["new_volume_mbps_in"], d_drop["error_pct"],
-            c=d_drop["time_norm"],
-            cmap="turbo",
-            vmin=0, vmax=1,
-            alpha=0.6,
-            s=50,
-            edgecolors="black",
-            linewidths=0.2,
-        )
-
-        # 基準線 (0%, ±10%)
-        ax.axhline(y=0, color="gray", linewidth=1.0, alpha=0.8)
-        ax.axhline(y=10,  color="red", linewidth=1.5, linestyle=":", alpha=0.6)
-        ax.axhline(y=-10, color="red", linewidth=1.5, linestyle=":", alpha=0.6)
-
-        ax.set_xlabel(G4_LABEL_X)
-        ax.set_ylabel(G4_LABEL_Y)
-        ax.set_title(G4_TITLE.format(tid=tid, start=start_date, end=end_date))
-
-        # 凡例の設定
-        custom_legend = [
-            Line2D([0], [0], color="red", lw=1.5, ls=":", label=G4_LABEL_THRESHOLD),
-            Line2D([0], [0], color="blue", marker="o", ls="None", label=f"n={len(d_drop)} (Total Drops)"),
-        ]
-        ax.legend(handles=custom_legend, loc="upper right", fontsize=9)
-
-        ax.grid(True, alpha=0.2)
-
-        # カラーバー（右側の時刻ガイド）
-        cbar = plt.colorbar(scatter, ax=ax)
-        cbar.set_label(G4_LABEL_CBAR)
-        cbar.set_ticks([i / 24 for i in range(0, 25, 3)])
-        cbar.set_ticklabels([f"{i:02d}:00" for i in range(0, 25, 3)])
-
-        plt.tight_layout()
-        fname = f"graph4_scatter_{tid}.png"
-        fpath = os.path.join(output_dir, fname)
-        fig.savefig(fpath, bbox_inches="tight")
+    # 期間フィルタ + 制限が発動（ドロップ発生）しているデータの抽出を1回で行い、ID別に分割する
+    in_range = _date_range_mask(df["timestamp"], start_date, end_date)
+    by_id = _split_by_id(df, in_range & (df["new_dropped_packets_in"].to_numpy() > 0))
+
+    # 1枚の Figure を使い回し、ループごとの生成・破棄を避ける
+    fig = plt.figure(figsize=(12, 7))
+    try:
+        for tid in target_ids:
+            d_drop = by_id.get(tid)
+            if d_drop is None:
+                continue
+
+            # 列を追加した DataFrame は作らず、描画に使う列だけを配列として扱う
+            # limit<=0 の行はゼロ除算せず NaN とする
+            volume = d_drop["new_volume_mbps_in"].to_numpy()
+            error_pct = calc_error_pct(volume, d_drop["limit_mbps_in"].to_numpy())
+            # NaN 行を除外
+            valid = ~np.isnan(error_pct)
+            n_points = int(valid.sum())
+            if n_points == 0:
+                continue
+            volume = volume[valid]
+            error_pct = error_pct[valid]
+
+            # 時刻を0〜1に正規化（色の指定用: 00:00=0, 23:55=1）
+            ts = d_drop["timestamp"].to_numpy()[valid]
+            minute_of_day = (ts - ts.astype("datetime64[D]")) // np.timedelta64(1, "m")
+            time_norm = minute_of_day / (24 * 60)
+
+            fig.clf()
+            ax = fig.add_subplot()
+
+            if n_points > G4_RASTER_THRESHOLD:
+                # 点数が多い場合はラスタ画像として一括描画
+                scatter = _draw_time_raster(ax, volume, error_pct, time_norm)
+            else:
+                # 散布図の描画（複数日分が重なるため alpha=0.5 で透過）
+                scatter = ax.scatter(
+                    volume, error_pct,
+                    c=time_norm,
+                    cmap="turbo",
+                    vmin=0, vmax=1,
+                    alpha=0.6,
+                    s=50,
+                    edgecolors="black",
+                    linewidths=0.2,
+                )
+
+            # 基準線 (0%, ±10%)
+            ax.axhline(y=0, color="gray", linewidth=1.0, alpha=0.8)
+            ax.axhline(y=10,  color="red", linewidth=1.5, linestyle=":", alpha=0.6)
+            ax.axhline(y=-10, color="red", linewidth=1.5, linestyle=":", alpha=0.6)
+
+            ax.set_xlabel(G4_LABEL_X)
+            ax.set_ylabel(G4_LABEL_Y)
+            ax.set_title(G4_TITLE.format(tid=tid, start=start_date, end=end_date))
+
+            # 凡例の設定
+            custom_legend = [
+                Line2D([0], [0], color="red", lw=1.5, ls=":", label=G4_LABEL_THRESHOLD),
+                Line2D([0], [0], color="blue", marker="o", ls="None", label=f"n={n_points} (Total Drops)"),
+            ]
+            ax.legend(handles=custom_legend, loc="upper right", fontsize=9)
+
+            ax.grid(True, alpha=0.2)
+
+            # カラーバー（右側の時刻ガイド）
+            cbar = fig.colorbar(scatter, ax=ax)
+            cbar.set_label(G4_LABEL_CBAR)
+            cbar.set_ticks([i / 24 for i in range(0, 25, 3)])
+            cbar.set_ticklabels([f"{i:02d}:00" for i in range(0, 25, 3)])
+
+            fig.tight_layout()
+            fpath = f"{out_prefix}{tid}.png"
+            _save_figure(fig, fpath)
+            saved.append(fpath)
+    finally:
         plt.close(fig)
-        saved.append(fpath)
 
     return saved
@@ -20,6 +20,8 @@ merge_csv.py - CSV統合モジュール
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 from .calc_traffic import bytes_to_mbps
 
@@ -57,14 +59,17 @@ COL_LIM = {
 # 内部関数
 # ---------------------------------------------------------------------------
 
-def _read_csv_with_encoding(path):
+def _read_csv_with_encoding(path, usecols=None):
     """
     複数の文字コードを試行してCSVを読み込む（内部関数）。
     UTF-8 -> CP932 (Shift_JIS) -> EUC-JP の順に試行する。
+    usecols を指定した場合はその列だけをパースする。
+    (列名の判定関数として渡すため、列が欠けていても文字コード判定の失敗とは混同しない)
     """
+    col_filter = None if usecols is None else set(usecols).__contains__
     for enc in ["utf-8", "cp932", "euc-jp"]:
         try:
-            return pd.read_csv(path, encoding=enc)
+            return pd.read_csv(path, encoding=enc, usecols=col_filter)
         except (UnicodeDecodeError, ValueError):
             continue
     raise UnicodeDecodeError(f"ファイルの読み込みに失敗しました（対応外の文字コード）: {path}")
@@ -76,9 +81,17 @@ def _read_csv_with_encoding(path):
 
 def merge_traffic_csv(new_path, current_path, limit_path, output_path):
     # --- 1. 3種のCSV.gzを読み込み ---
-    df_new = _read_csv_with_encoding(new_path).fillna(0)
-    df_cur = _read_csv_with_encoding(current_path).fillna(0)
-    df_lim = _read_csv_with_encoding(limit_path).fillna(0)
+    # 数値列の欠損補完はマージ後に一括で行う（手順6）
+    # ヘッダー定義にある列だけを読み込み、未使用列のパースとメモリ確保を省く
+    # 3ファイルは互いに独立しているため、スレッドで並行して読み込む
+    # (gzip 展開と pandas の C パーサーは GIL を解放するため並行に進む)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        fut_new = pool.submit(_read_csv_with_encoding, new_path, list(COL_NEW.values()))
+        fut_cur = pool.submit(_read_csv_with_encoding, current_path, list(COL_CUR.values()))
+        fut_lim = pool.submit(_read_csv_with_encoding, limit_path, list(COL_LIM.values()))
+        df_new = fut_new.result()
+        df_cur = fut_cur.result()
+        df_lim = fut_lim.result()
 
     # --- 2. 各データの整形と列名固定（マージ前に "timestamp" と "id" に統一） ---
     
@@ -109,6 +122,8 @@ def merge_traffic_csv(new_path, current_path, limit_path, output_path):
         COL_LIM["id"]: "id",
         COL_LIM["limit_kbps_in"]: "limit_kbps_in"
     })
+    # 上限値はリサンプリングで前方補完するため、欠損を先に0埋めしておく
+    df_lim["limit_kbps_in"] = df_lim["limit_kbps_in"].fillna(0)
     df_lim = df_lim.sort_values(["timestamp", "id"])
     
     # リサンプリング処理
@@ -139,11 +154,19 @@ def merge_traffic_csv(new_path, current_path, limit_path, output_path):
     num_cols = ["new_volume_bytes_in", "new_volume_bytes_out", 
                 "new_dropped_packets_in", "new_dropped_bytes_in",
                 "cur_volume_bytes_in", "cur_volume_bytes_out", "limit_kbps_in"]
-    # 存在しない行がマージで作られるため、一括で0埋め
+    # 入力の空白セルとマージで作られた欠損行を、ここで一括して0埋め
     df_merged[num_cols] = df_merged[num_cols].fillna(0)
 
     # --- 7. ID分解と属性補完 ---
-    df_merged[["limit_group", "poi_code"]] = df_merged["id"].str.rsplit("-", n=1, expand=True)
+    # ID の種類はレコード数より十分少ないため、ユニークなIDだけを分解して各行へ割り当てる
+    id_cat = df_merged["id"].astype("category")
+    id_parts = (
+        id_cat.cat.categories.to_series()
+        .str.rsplit("-", n=1, expand=True)
+        .reindex(columns=[0, 1])
+    )
+    df_merged["limit_group"] = id_cat.map(id_parts[0]).astype("str")
+    df_merged["poi_code"] = id_cat.map(id_parts[1]).astype("str")
     # outer結合で欠落した属性情報を埋める
     df_merged["limit_group"] = df_merged.groupby("id")["limit_group"].ffill().bfill()
     df_merged["poi_code"] = df_merged.groupby("id")["poi_code"].ffill().bfill()
@@ -9,6 +9,7 @@
 
 import logging
 import sys
+from typing import Optional
 
 from src.cli import create_parser
 
@@ -20,6 +21,28 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _connection_error_message(exc: Exception) -> Optional[str]:
+    """netmiko の認証失敗・接続タイムアウトの例外であれば、表示するメッセージを返す。
+
+    netmiko は転送を実行するときだけ読み込むため、ここでは import せず、読み込み済みの
+    モジュールから例外クラスを参照する（未読み込みであれば netmiko の例外は発生しない）。
+
+    Args:
+        exc: 転送中に発生した例外。
+
+    Returns:
+        ロガーに渡すメッセージ（%s に例外が入る）。該当しない例外の場合は None。
+    """
+    exceptions = sys.modules.get("netmiko.exceptions")
+    if exceptions is None:
+        return None
+    if isinstance(exc, exceptions.NetmikoAuthenticationException):
+        return "認証に失敗しました（ユーザー名・パスワードを確認してください）: %s"
+    if isinstance(exc, exceptions.NetmikoTimeoutException):
+        return "接続に失敗しました（ホスト・ポートを確認してください）: %s"
+    return None
+
+
 def main() -> None:
     """CLI エントリーポイント。
 
@@ -48,7 +71,12 @@ def main() -> None:
     except KeyboardInterrupt:
         print("\n中断されました。", file=sys.stderr)
         sys.exit(130)
-
+    except Exception as e:
+        message = _connection_error_message(e)
+        if message is None:
+            raise
+        logger.error(message, e)
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
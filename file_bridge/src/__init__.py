@@ -8,6 +8,23 @@ Jupyter Notebook からは以下のようにインポートして使用します
     client.download(remote="/data/*.csv", local="./downloads/")
 """
 
-from .client import SCPClient
-
 __all__ = ["SCPClient"]
+
+
+def __getattr__(name: str):
+    """SCPClient を初回参照時に読み込む（CLI の --help で netmiko を読み込まないため）。
+
+    Args:
+        name: 参照された属性名。
+
+    Returns:
+        SCPClient クラス。
+
+    Raises:
+        AttributeError: SCPClient 以外の未定義属性を参照した場合。
+    """
+    if name == "SCPClient":
+        from .client import SCPClient
+
+        return SCPClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
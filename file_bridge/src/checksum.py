@@ -2,13 +2,23 @@
 
 import hashlib
 import logging
+import shlex
 from pathlib import Path
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
-CHUNK_SIZE = 8192
-SHA256_COMMAND = 'sha256sum "{path}"'
+# ハッシュ計算時の読み込み単位（大きめにして read 回数とループ回数を減らす）
+CHUNK_SIZE = 1 << 18
+# {path} には shlex.quote 済みのパスを渡す
+SHA256_COMMAND = "sha256sum {path}"
+# リモート sha256sum の 1 ファイルあたりの読み取りタイムアウト（秒）
+SHA256_READ_TIMEOUT = 120
+# 1 回の sha256sum コマンドでハッシュを計算するファイル数（コマンド長の上限対策）
+SHA256_BATCH_SIZE = 200
+# 一括計算 1 回あたりの読み取りタイムアウトの上限（秒）。
+# 超えた場合はそのバッチを諦め、転送時にファイルごとに計算する
+SHA256_BATCH_READ_TIMEOUT_MAX = 600
 
 
 def calculate_local_sha256(file_path: Path) -> str:
@@ -29,10 +39,19 @@ def calculate_local_sha256(file_path: Path) -> str:
         >>> len(hash_value)
         64
     """
-    sha256 = hashlib.sha256()
     with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
-            sha256.update(chunk)
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11 以降: 読み込みとハッシュ更新のループを C 実装に任せる
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        # 確保済みバッファへ readinto し、チャンクごとの bytes オブジェクト生成を避ける
+        sha256 = hashlib.sha256()
+        buf = bytearray(CHUNK_SIZE)
+        view = memoryview(buf)
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            sha256.update(view[:n])
     return sha256.hexdigest()
 
 
@@ -57,14 +76,83 @@ def calculate_remote_sha256(connection: Any, remote_path: str) -> str:
         >>> len(hash_value)
         64
     """
-    command = SHA256_COMMAND.format(path=remote_path)
-    output = connection.send_command(command, read_timeout=120)
-    parts = output.strip().split()
-    if not parts or len(parts) < 2:
+    command = SHA256_COMMAND.format(path=shlex.quote(remote_path))
+    # 接続時に取得済みのプロンプトで完了を判定し、find_prompt の往復を省く
+    output = connection.send_command(
+        command, read_timeout=SHA256_READ_TIMEOUT, auto_find_prompt=False
+    )
+    # 先頭のハッシュ値とその後ろだけが必要なので、出力全体は分割しない
+    parts = output.strip().split(maxsplit=1)
+    if len(parts) < 2:
         raise ValueError(f"sha256sum の出力が予期しない形式です: {output!r}")
     return parts[0]
 
 
+def calculate_remote_sha256_batch(connection: Any, remote_paths: list[str]) -> dict[str, str]:
+    """複数のリモートファイルの SHA-256 ハッシュをまとめて計算する。
+
+    ファイルごとに sha256sum を実行せず、SHA256_BATCH_SIZE 件ずつ 1 回の
+    コマンドで計算してリモートとの往復回数を減らす。
+    タイムアウトなどで失敗したバッチのファイルは結果に含めない
+    （呼び出し側で calculate_remote_sha256 により個別に計算する）。
+    失敗時は実行中の sha256sum を中断してチャネルを読み捨て、プロンプトに
+    同期し直してから次へ進む（残った出力を後続コマンドの結果と誤読しないため）。
+
+    Args:
+        connection: netmiko の ConnectHandler インスタンス。
+        remote_paths: ハッシュを計算するリモートファイルパスのリスト。
+
+    Returns:
+        リモートファイルパスから SHA-256 ハッシュへの辞書。
+        読み込めなかったファイルや、sha256sum がパスをエスケープして出力した
+        ファイル（改行・バックスラッシュを含む名前）は含まれない。
+
+    Examples:
+        >>> hashes = calculate_remote_sha256_batch(conn, ["/data/a.csv", "/data/b.csv"])
+        >>> len(hashes["/data/a.csv"])
+        64
+    """
+    hashes: dict[str, str] = {}
+    for start in range(0, len(remote_paths), SHA256_BATCH_SIZE):
+        batch = remote_paths[start:start + SHA256_BATCH_SIZE]
+        quoted = " ".join(shlex.quote(path) for path in batch)
+        try:
+            output = connection.send_command(
+                f"sha256sum {quoted} 2>/dev/null",
+                read_timeout=min(
+                    SHA256_READ_TIMEOUT * len(batch), SHA256_BATCH_READ_TIMEOUT_MAX
+                ),
+                auto_find_prompt=False,
+            )
+        except Exception as exc:
+            logger.warning("SHA-256 の一括計算に失敗しました。個別に計算します: %s", exc)
+            resync_channel(connection)
+            continue
+        for line in output.splitlines():
+            parts = line.strip().split(maxsplit=1)
+            if len(parts) == 2:
+                hashes[parts[1]] = parts[0]
+    return hashes
+
+
+def resync_channel(connection: Any) -> None:
+    """中断したコマンドの残り出力を読み捨て、チャネルをプロンプトに同期し直す。
+
+    Args:
+        connection: netmiko の ConnectHandler インスタンス。
+
+    Returns:
+        None
+    """
+    try:
+        # Ctrl-C で実行中のコマンドを止め、出力の残りを捨ててからプロンプトを待つ
+        connection.write_channel("\x03")
+        connection.clear_buffer()
+        connection.find_prompt()
+    except Exception as exc:
+        logger.warning("リモートシェルの再同期に失敗しました: %s", exc)
+
+
 def verify_checksum(local_hash: str, remote_hash: str) -> bool:
     """ローカルとリモートのチェックサムを比較する。
 
@@ -81,6 +169,10 @@ def verify_checksum(local_hash: str, remote_hash: str) -> bool:
         >>> verify_checksum("abc123", "def456")
         False
     """
+    # hexdigest も sha256sum も小文字で出力するため、通常は lower() による
+    # 文字列の生成を行わずに完全一致で判定できる
+    if local_hash == remote_hash:
+        return True
     return local_hash.lower() == remote_hash.lower()
 
 
@@ -12,7 +12,6 @@ import getpass
 import sys
 from typing import Optional
 
-from .client import SCPClient
 from .config import ConfigLoader, ServerProfile, TransferConfig, DEFAULT_CONFIG_FILE
 
 
@@ -112,6 +111,9 @@ def cmd_download(args: argparse.Namespace) -> None:
     profile = loader.get_profile(getattr(args, "profile", None))
     cfg = build_transfer_config(args, profile)
 
+    # netmiko の読み込みは転送を実行するときだけ行う（--help を軽くするため）
+    from .client import SCPClient
+
     client = SCPClient(
         host=cfg.host,
         port=cfg.port,
@@ -140,6 +142,9 @@ def cmd_upload(args: argparse.Namespace) -> None:
     profile = loader.get_profile(getattr(args, "profile", None))
     cfg = build_transfer_config(args, profile)
 
+    # netmiko の読み込みは転送を実行するときだけ行う（--help を軽くするため）
+    from .client import SCPClient
+
     client = SCPClient(
         host=cfg.host,
         port=cfg.port,
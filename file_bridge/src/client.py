@@ -1,28 +1,101 @@
 """SCP ファイル転送クライアントモジュール。"""
 
+import contextlib
+import functools
 import glob as glob_module
+import html
 import logging
+import os
+import random
+import shlex
+import socket
 import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Iterator, Optional
 
 from netmiko import ConnectHandler
+from netmiko.exceptions import NetmikoAuthenticationException, NetmikoTimeoutException
 from netmiko.scp_handler import SCPConn
 
-from .checksum import calculate_local_sha256, calculate_remote_sha256, verify_checksum
+from .checksum import (
+    calculate_local_sha256,
+    calculate_remote_sha256,
+    calculate_remote_sha256_batch,
+    resync_channel,
+    verify_checksum,
+)
 from .logger import TransferLogger, TransferRecord
 
 logger = logging.getLogger(__name__)
 
 SSH_TIMEOUT = 60
+# 認証応答を待つ上限（秒）。応答しないサーバーで転送全体のタイムアウトまで待たない
+SSH_AUTH_TIMEOUT = 15
+# SSH 接続の試行回数と、再試行までの待ち時間（指数バックオフ + ジッター）
+# 待ち時間 = min(上限, 基準 * 2^(試行回数 - 1) * (1 + ジッター係数 * 乱数))
+CONNECT_ATTEMPTS = 3
+CONNECT_BACKOFF_BASE = 1.0
+CONNECT_BACKOFF_CAP = 30.0
+CONNECT_BACKOFF_JITTER = 0.5
+# persistent モードで接続を保持している間の SSH keepalive 間隔（秒）
+SSH_KEEPALIVE = 30
+# persistent モードで保持した接続を張り直すまでのアイドル時間・最大寿命（秒）
+PERSISTENT_IDLE_TIMEOUT = 300
+PERSISTENT_MAX_AGE = 3600
+# 転送中に発生した場合に persistent 接続を破棄する、接続・転送路の障害を表す例外
+# （ファイルが見つからない等のそれ以外の例外では接続を保持したまま呼び出し元へ送出する）
+_CONNECTION_ERRORS = (
+    NetmikoTimeoutException,
+    NetmikoAuthenticationException,
+    ConnectionError,
+    socket.timeout,
+    EOFError,
+)
+# SCP チャネルの無通信タイムアウト（秒）。応答が途絶えた転送をこの時間で打ち切る
 SCP_SOCKET_TIMEOUT = 60.0
+# プロンプトを変えない定型の参照系コマンド（find / stat / sha256sum）に限り、
+# send_command に auto_find_prompt=False を渡して取得済みのプロンプトで完了を判定する
+# （コマンドごとの find_prompt による往復を省く）。それ以外のコマンドでは省略しない
 SEND_CMD_TIMEOUT = 120
-
-
+# リモートのパターン展開・ディレクトリの再帰列挙を 1 回で行うコマンド
+# （エントリごとの test -d / find の往復をなくす）
+LIST_REMOTE_FILES_COMMAND = (
+    "for e in {pattern}; do "
+    'if [ -d "$e" ]; then find "$e" -type f; '
+    'elif [ -e "$e" ]; then echo "$e"; fi; '
+    "done 2>/dev/null"
+)
+# 複数ファイルのサイズを「サイズ パス」の形式で 1 行ずつ出力するコマンド
+STAT_SIZE_COMMAND = "stat -c '%s %n' {paths} 2>/dev/null"
+# 1 回の stat コマンドでサイズを取得するファイル数（コマンド長の上限対策）
+STAT_BATCH_SIZE = 200
+# アップロード時にローカルの SHA-256 を先行計算するスレッド数
+LOCAL_HASH_WORKERS = 2
+
+# Jupyter サマリーの行表示（成否 -> (状態ラベル, 背景色)）
+SUMMARY_ROW_STYLES = {
+    True: ("✓ 成功", "#d4edda"),
+    False: ("✗ 失敗", "#f8d7da"),
+}
+# Jupyter サマリーのテーブル開始タグとヘッダー行（呼び出しごとに組み立て直さない）
+SUMMARY_TABLE_HEAD = (
+    '<table border="1" style="border-collapse:collapse;width:100%;">'
+    '<thead><tr style="background-color:#343a40;color:white;">'
+    "<th>ファイル</th><th>状態</th><th>エラー</th>"
+    "</tr></thead>"
+)
+
+
+@functools.lru_cache(maxsize=1)
 def _is_jupyter() -> bool:
     """Jupyter 環境で実行されているかどうかを判定する。
 
+    実行環境はプロセス中で変わらないため、判定結果をキャッシュし
+    SCPClient を生成するたびに IPython の読み込みを試行しない。
+
     Returns:
         Jupyter Notebook / JupyterLab 環境の場合は True、そうでない場合は False。
 
@@ -39,6 +112,127 @@ def _is_jupyter() -> bool:
         return False
 
 
+class _SCPSession:
+    """1 回の転送処理の間、SCP 用の SSH セッションを使い回すラッパー。
+
+    netmiko の SCPConn は生成のたびに SSH 接続（鍵交換・認証）を確立するため、
+    ファイルごとに生成せず、最初の転送で確立したものを後続ファイルでも使う。
+    転送に失敗した場合は reset() で破棄し、次のファイルで張り直す。
+    SCP 用の SSH 接続は制御用の接続とは別のため、再利用する前に生存を確認する。
+
+    Args:
+        connection: 接続済みの ConnectHandler インスタンス。
+        keepalive: SCP 用 SSH トランスポートの keepalive 間隔（秒）。0 の場合は送らない。
+    """
+
+    def __init__(self, connection: ConnectHandler, keepalive: int = 0) -> None:
+        self._connection = connection
+        self._keepalive = keepalive
+        self._scp_conn: Optional[SCPConn] = None
+
+    def __enter__(self) -> "_SCPSession":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.reset()
+
+    def is_alive(self) -> bool:
+        """SCP セッションの SSH トランスポートが生きているかどうかを返す。
+
+        Returns:
+            セッションが確立済みで、トランスポートが有効な場合は True。
+        """
+        if self._scp_conn is None:
+            return False
+        try:
+            transport = self._scp_conn.scp_conn.get_transport()
+        except Exception:
+            return False
+        return transport is not None and transport.is_active()
+
+    def reset_if_dead(self) -> None:
+        """確立済みの SCP セッションが切断されていれば破棄する。
+
+        Returns:
+            None
+        """
+        if self._scp_conn is not None and not self.is_alive():
+            logger.info("SCP セッションが切断されていたため張り直します")
+            self.reset()
+
+    def get(self) -> SCPConn:
+        """SCP セッションを返す（未確立、または切断されていれば確立し直す）。
+
+        Returns:
+            確立済みの SCPConn インスタンス。
+        """
+        self.reset_if_dead()
+        if self._scp_conn is None:
+            self._scp_conn = SCPConn(self._connection, socket_timeout=SCP_SOCKET_TIMEOUT)
+            if self._keepalive:
+                # 転送の合間に SCP 用の接続がアイドル切断されないよう keepalive を送る
+                self._scp_conn.scp_conn.get_transport().set_keepalive(self._keepalive)
+        return self._scp_conn
+
+    def reset(self) -> None:
+        """SCP セッションを閉じて破棄する。
+
+        Returns:
+            None
+        """
+        if self._scp_conn is not None:
+            scp_conn, self._scp_conn = self._scp_conn, None
+            try:
+                scp_conn.close()
+            except Exception as exc:
+                logger.warning("SCP セッションのクローズに失敗しました: %s", exc)
+
+
+class _LocalHashPrefetcher:
+    """ローカルファイルの SHA-256 を転送と並行して先行計算する。
+
+    アップロード開始時に全ファイルのハッシュ計算を LOCAL_HASH_WORKERS 本の
+    スレッドへ投入し、SSH 接続の確立や前のファイルの転送中に計算を済ませておく。
+    終了時に未着手の計算は取り消す。
+
+    Args:
+        paths: ハッシュを計算するローカルファイルパスのリスト。空の場合は何もしない。
+    """
+
+    def __init__(self, paths: list[Path]) -> None:
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: dict[Path, Future] = {}
+        if paths:
+            self._executor = ThreadPoolExecutor(max_workers=LOCAL_HASH_WORKERS)
+            self._futures = {
+                path: self._executor.submit(calculate_local_sha256, path) for path in paths
+            }
+
+    def __enter__(self) -> "_LocalHashPrefetcher":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def get(self, path: Path) -> str:
+        """ファイルの SHA-256 を返す（先行計算が無ければその場で計算する）。
+
+        Args:
+            path: ハッシュを取得するローカルファイルパス。
+
+        Returns:
+            SHA-256 ハッシュの 16 進数文字列。
+
+        Raises:
+            OSError: ファイルの読み込みに失敗した場合。
+        """
+        future = self._futures.get(path)
+        if future is None:
+            return calculate_local_sha256(path)
+        return future.result()
+
+
 class SCPClient:
     """SCP プロトコルを用いたファイル転送クライアント。
 
@@ -50,12 +244,20 @@ class SCPClient:
         port: SSH ポート番号。
         user: SSH ユーザー名。
         use_checksum: チェックサム検証の有効フラグ。
+        persistent: download / upload 間で SSH 接続を使い回すかどうか。
         transfer_logger: 転送ログマネージャ。
 
     Examples:
         >>> client = SCPClient(host="192.168.3.61", user="sysope", password="secret")
         >>> results = client.download(remote="/data/*.csv", local="./output/")
         >>> results = client.upload(local="./data/*.csv", remote="/uploads/")
+
+        複数回の転送で SSH 接続を使い回す場合:
+
+        >>> with SCPClient(host="192.168.3.61", user="sysope", password="secret",
+        ...                persistent=True) as client:
+        ...     client.download(remote="/data/a/*.csv", local="./a/")
+        ...     client.download(remote="/data/b/*.csv", local="./b/")
     """
 
     def __init__(
@@ -66,6 +268,7 @@ class SCPClient:
         port: int = 22,
         log_file: str = "transfer.log",
         use_checksum: bool = True,
+        persistent: bool = False,
     ) -> None:
         """SCPClient を初期化する。
 
@@ -76,18 +279,58 @@ class SCPClient:
             port: SSH ポート番号（デフォルト: 22）。
             log_file: ログファイルのパス。
             use_checksum: チェックサム検証を有効にするか（デフォルト: True）。
+            persistent: True の場合、最初の転送で確立した SSH 接続を close() まで
+                使い回す（デフォルト: False。転送ごとに接続・切断する）。
         """
         self.host = host
         self.port = port
         self.user = user
         self._password = password
         self.use_checksum = use_checksum
+        self.persistent = persistent
         self.transfer_logger = TransferLogger(log_file)
         self._jupyter = _is_jupyter()
+        self._connection: Optional[ConnectHandler] = None
+        self._scp_session: Optional[_SCPSession] = None
+        # persistent 接続の確立時刻と最終使用時刻（time.monotonic の値）
+        self._connection_created_at = 0.0
+        self._connection_last_used = 0.0
+        # persistent 接続上で mkdir 済みのリモートディレクトリ（接続を閉じるとクリア）
+        self._created_remote_dirs: set[str] = set()
+        # Jupyter の進捗表示領域（転送ごとに作り直し、以降は update で書き換える）
+        self._progress_handle: Optional[Any] = None
+
+    def __enter__(self) -> "SCPClient":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """persistent モードで保持している SCP セッションと SSH 接続を切断する。
+
+        接続を保持していない場合は何もしない。
+
+        Returns:
+            None
+        """
+        self._created_remote_dirs.clear()
+        if self._scp_session is not None:
+            scp_session, self._scp_session = self._scp_session, None
+            scp_session.reset()
+        if self._connection is not None:
+            conn, self._connection = self._connection, None
+            try:
+                conn.disconnect()
+            except Exception as exc:
+                logger.warning("SSH 接続の切断に失敗しました: %s", exc)
 
     def _create_connection(self) -> ConnectHandler:
         """SSH 接続を確立して返す。
 
+        接続タイムアウトなど一時的な失敗は CONNECT_ATTEMPTS 回まで指数バックオフで
+        再試行する。認証失敗は再試行しても成功しないため待たずに送出する。
+
         Returns:
             接続済みの ConnectHandler インスタンス。
 
@@ -102,10 +345,120 @@ class SCPClient:
             "password": self._password,
             "port": self.port,
             "timeout": SSH_TIMEOUT,
+            "auth_timeout": SSH_AUTH_TIMEOUT,
         }
+        if self.persistent:
+            # 転送の合間にアイドル切断されないよう keepalive を送る
+            device_params["keepalive"] = SSH_KEEPALIVE
         logger.info("SSH 接続を確立します: %s@%s:%d", self.user, self.host, self.port)
+        for attempt in range(1, CONNECT_ATTEMPTS):
+            try:
+                return ConnectHandler(**device_params)
+            except NetmikoAuthenticationException:
+                raise
+            except (NetmikoTimeoutException, OSError) as exc:
+                delay = min(
+                    CONNECT_BACKOFF_CAP,
+                    CONNECT_BACKOFF_BASE * 2 ** (attempt - 1)
+                    * (1 + CONNECT_BACKOFF_JITTER * random.random()),
+                )
+                logger.warning(
+                    "SSH 接続に失敗しました（%d/%d 回目）: %s — %.1f 秒後に再試行します",
+                    attempt, CONNECT_ATTEMPTS, exc, delay,
+                )
+                time.sleep(delay)
+        # 最後の試行は例外をそのまま呼び出し元へ送出する
         return ConnectHandler(**device_params)
 
+    @contextlib.contextmanager
+    def _connection_scope(self) -> Iterator[ConnectHandler]:
+        """1 回の転送で使う SSH 接続を提供する。
+
+        persistent モードでは保持している接続を再利用し、転送後も切断しない。
+        接続が切れている場合や、PERSISTENT_IDLE_TIMEOUT 以上使われていない場合、
+        確立から PERSISTENT_MAX_AGE 以上経過した場合は SCP セッションとともに張り直す。
+        SCP セッションだけが切れている場合は SCP セッションを破棄する。
+        再利用する接続ではプロンプトを取得し直す。
+        転送中に接続・転送路の障害（_CONNECTION_ERRORS）が発生した場合や、例外の発生後に
+        接続が切れている場合、KeyboardInterrupt などで中断された場合は接続を破棄する。
+        通常モードでは転送ごとに接続し、終了時に切断する。
+
+        Yields:
+            接続済みの ConnectHandler インスタンス。
+        """
+        if not self.persistent:
+            with self._create_connection() as conn:
+                yield conn
+            return
+
+        now = time.monotonic()
+        if self._connection is not None:
+            if (
+                now - self._connection_last_used >= PERSISTENT_IDLE_TIMEOUT
+                or now - self._connection_created_at >= PERSISTENT_MAX_AGE
+                or not self._connection.is_alive()
+            ):
+                self.close()
+            else:
+                try:
+                    # 保持中にプロンプトが変わっている可能性があるため、転送ごとに 1 回だけ
+                    # 取得し直す（auto_find_prompt=False のコマンドはこのプロンプトで判定する）
+                    self._connection.set_base_prompt()
+                except Exception as exc:
+                    logger.warning("プロンプトを取得できないため SSH 接続を張り直します: %s", exc)
+                    self.close()
+        if self._scp_session is not None:
+            # 制御用の接続が生きていても、SCP 用の接続だけが切れている場合がある
+            self._scp_session.reset_if_dead()
+        if self._connection is None:
+            self._connection = self._create_connection()
+            self._connection_created_at = time.monotonic()
+        try:
+            yield self._connection
+        except Exception as exc:
+            if isinstance(exc, _CONNECTION_ERRORS) or not self._connection.is_alive():
+                self.close()
+            raise
+        except BaseException:
+            # コマンドの途中で中断された場合、チャネルの状態が分からないため再利用しない
+            self.close()
+            raise
+        finally:
+            # 接続を保持したまま例外を送出する場合も、使用時刻を更新する
+            self._connection_last_used = time.monotonic()
+
+    @contextlib.contextmanager
+    def _scp_session_scope(self, connection: ConnectHandler) -> Iterator[_SCPSession]:
+        """1 回の転送で使う SCP セッションを提供する。
+
+        persistent モードでは SSH 接続と同様に close() まで保持して次の転送でも使い、
+        通常モードでは転送の終了時に閉じる。
+
+        Args:
+            connection: _connection_scope が提供した接続済みの ConnectHandler。
+
+        Yields:
+            _SCPSession インスタンス。
+        """
+        if not self.persistent:
+            with _SCPSession(connection) as scp_session:
+                yield scp_session
+            return
+
+        if self._scp_session is None:
+            self._scp_session = _SCPSession(connection, keepalive=SSH_KEEPALIVE)
+        yield self._scp_session
+
+    @contextlib.contextmanager
+    def _transfer_scope(self) -> Iterator[tuple[ConnectHandler, _SCPSession]]:
+        """1 回の転送で使う SSH 接続と SCP セッションの組を提供する。
+
+        Yields:
+            (ConnectHandler, _SCPSession) のタプル。
+        """
+        with self._connection_scope() as conn, self._scp_session_scope(conn) as scp_session:
+            yield conn, scp_session
+
     def _list_remote_files(
         self, connection: ConnectHandler, remote_pattern: str
     ) -> list[str]:
@@ -125,56 +478,87 @@ class SCPClient:
             FileNotFoundError: パターンに一致するファイルが存在しない場合。
         """
         output = connection.send_command(
-            f"ls -1d {remote_pattern} 2>/dev/null",
+            LIST_REMOTE_FILES_COMMAND.format(pattern=remote_pattern),
             read_timeout=SEND_CMD_TIMEOUT,
+            auto_find_prompt=False,
         )
-        entries = [line.strip() for line in output.strip().splitlines() if line.strip()]
+        result = [line for line in map(str.strip, output.splitlines()) if line]
 
-        if not entries:
+        if not result:
             raise FileNotFoundError(
                 f"リモートにファイルが見つかりません: {remote_pattern}"
             )
 
-        result: list[str] = []
-        for entry in entries:
-            type_out = connection.send_command(
-                f'test -d "{entry}" && echo __DIR__ || echo __FILE__',
-                read_timeout=SEND_CMD_TIMEOUT,
-            )
-            if "__DIR__" in type_out:
-                sub_out = connection.send_command(
-                    f'find "{entry}" -type f 2>/dev/null',
-                    read_timeout=SEND_CMD_TIMEOUT,
-                )
-                sub_files = [
-                    ln.strip() for ln in sub_out.strip().splitlines() if ln.strip()
-                ]
-                result.extend(sub_files)
-            else:
-                result.append(entry)
-
         return result
 
-    def _get_remote_file_size(
-        self, connection: ConnectHandler, remote_path: str
-    ) -> int:
-        """リモートファイルのサイズをバイト単位で取得する。
+    def _stat_remote_files(
+        self, connection: ConnectHandler, remote_paths: list[str]
+    ) -> dict[str, int]:
+        """1 回の stat コマンドでリモートファイルのサイズを取得する。
 
         Args:
             connection: 接続済みの ConnectHandler インスタンス。
-            remote_path: サイズを取得するリモートファイルパス。
+            remote_paths: サイズを取得するリモートファイルパスのリスト。
 
         Returns:
-            ファイルサイズ（バイト）。取得できない場合は 0。
+            リモートファイルパスからサイズ（バイト）への辞書。
+            取得できなかったファイルは含まれない。
         """
+        quoted = " ".join(shlex.quote(path) for path in remote_paths)
         output = connection.send_command(
-            f'stat -c%s "{remote_path}" 2>/dev/null',
+            STAT_SIZE_COMMAND.format(paths=quoted),
             read_timeout=SEND_CMD_TIMEOUT,
+            auto_find_prompt=False,
         )
-        try:
-            return int(output.strip())
-        except ValueError:
-            return 0
+        sizes: dict[str, int] = {}
+        for line in output.splitlines():
+            size, _, path = line.strip().partition(" ")
+            if size.isdigit() and path:
+                sizes[path] = int(size)
+        return sizes
+
+    def _get_remote_file_sizes(
+        self, connection: ConnectHandler, remote_paths: list[str]
+    ) -> dict[str, int]:
+        """複数のリモートファイルのサイズをまとめて取得する。
+
+        ファイルごとに stat を実行せず、STAT_BATCH_SIZE 件ずつ 1 回の
+        コマンドで取得してリモートとの往復回数を減らす。
+        失敗したバッチのファイルは結果に含めず、転送時に個別に取得させる
+        （1 件の不具合でダウンロード全体を中断しないため）。
+        失敗時はチャネルをプロンプトに同期し直し、残った出力を後続の stat で誤読しない。
+
+        Args:
+            connection: 接続済みの ConnectHandler インスタンス。
+            remote_paths: サイズを取得するリモートファイルパスのリスト。
+
+        Returns:
+            リモートファイルパスからサイズ（バイト）への辞書。
+            取得できなかったファイルは含まれない。
+        """
+        sizes: dict[str, int] = {}
+        for start in range(0, len(remote_paths), STAT_BATCH_SIZE):
+            batch = remote_paths[start:start + STAT_BATCH_SIZE]
+            try:
+                sizes.update(self._stat_remote_files(connection, batch))
+            except Exception as exc:
+                logger.warning(
+                    "ファイルサイズの一括取得に失敗しました。個別に取得します: %s", exc
+                )
+                resync_channel(connection)
+        return sizes
+
+    def _get_remote_file_size(self, connection: ConnectHandler, remote_path: str) -> int:
+        """リモートファイルのサイズをバイト単位で取得する。
+
+        Args:
+            connection: 接続済みの ConnectHandler インスタンス。
+            remote_path: サイズを取得するリモートファイルパス。
+
+        Returns:
+            ファイルサイズ（バイト）。取得できない場合は 0。
+        """
+        return self._stat_remote_files(connection, [remote_path]).get(remote_path, 0)
 
     def _show_progress(
         self, current: int, total: int, filename: str, direction: str
@@ -193,12 +577,15 @@ class SCPClient:
         msg = f"[{current}/{total}] {direction} {filename}..."
         if self._jupyter:
             try:
-                from IPython.display import clear_output, display  # type: ignore[import]
-
-                clear_output(wait=True)
-                display(msg)
+                from IPython.display import display  # type: ignore[import]
             except ImportError:
                 print(f"\r{msg}", end="", flush=True)
+                return
+            # セル出力全体を消して描き直さず、進捗表示の領域だけを更新する
+            if current == 1 or self._progress_handle is None:
+                self._progress_handle = display(msg, display_id=True)
+            else:
+                self._progress_handle.update(msg)
         else:
             print(f"\r{msg:<80}", end="", flush=True)
 
@@ -238,10 +625,16 @@ class SCPClient:
 
         results: list[dict] = []
 
-        with self._create_connection() as conn:
+        with self._transfer_scope() as (conn, scp_session):
             remote_files = self._list_remote_files(conn, remote)
             total = len(remote_files)
             logger.info("ダウンロード対象: %d ファイル", total)
+            remote_sizes = self._get_remote_file_sizes(conn, remote_files)
+            # リモートハッシュはファイルごとに問い合わせず転送前にまとめて計算する
+            remote_hashes = (
+                calculate_remote_sha256_batch(conn, remote_files)
+                if self.use_checksum else {}
+            )
 
             for i, remote_file in enumerate(remote_files, 1):
                 filename = Path(remote_file).name
@@ -251,21 +644,28 @@ class SCPClient:
                 success = False
                 error_msg = ""
                 checksum_result = ""
-                file_size = self._get_remote_file_size(conn, remote_file)
+                file_size = 0
 
                 try:
-                    scp_conn = SCPConn(conn)
+                    if remote_file in remote_sizes:
+                        file_size = remote_sizes[remote_file]
+                    else:
+                        file_size = self._get_remote_file_size(conn, remote_file)
+
                     try:
-                        scp_conn.scp_get_file(
+                        scp_session.get().scp_get_file(
                             source_file=remote_file,
                             dest_file=str(local_file),
                         )
-                    finally:
-                        scp_conn.close()
+                    except Exception:
+                        scp_session.reset()
+                        raise
 
                     if self.use_checksum:
                         local_hash = calculate_local_sha256(local_file)
-                        remote_hash = calculate_remote_sha256(conn, remote_file)
+                        remote_hash = remote_hashes.get(remote_file) or (
+                            calculate_remote_sha256(conn, remote_file)
+                        )
                         if verify_checksum(local_hash, remote_hash):
                             checksum_result = f"SHA256: {local_hash}"
                             success = True
@@ -332,8 +732,10 @@ class SCPClient:
             FileNotFoundError: ローカルファイルが 1 件も見つからない場合。
             netmiko.exceptions.NetmikoAuthenticationException: 認証に失敗した場合。
         """
-        local_files = sorted(glob_module.glob(local, recursive=True))
-        local_files = [f for f in local_files if Path(f).is_file()]
+        # 一致したパスを逐次判定し、ファイルだけを 1 回ソートする（Path の生成を省く）
+        local_files = sorted(
+            f for f in glob_module.iglob(local, recursive=True) if os.path.isfile(f)
+        )
 
         if not local_files:
             raise FileNotFoundError(
@@ -345,11 +747,18 @@ class SCPClient:
         total = len(local_files)
         logger.info("アップロード対象: %d ファイル", total)
 
-        with self._create_connection() as conn:
-            conn.send_command(
-                f'mkdir -p "{remote_dir}" 2>/dev/null',
-                read_timeout=SEND_CMD_TIMEOUT,
-            )
+        local_hashes = _LocalHashPrefetcher(
+            [Path(f) for f in local_files] if self.use_checksum else []
+        )
+        with local_hashes, self._transfer_scope() as (conn, scp_session):
+            # persistent 接続で作成済みのディレクトリには mkdir を送らない（往復 1 回分の削減）
+            if remote_dir not in self._created_remote_dirs:
+                conn.send_command(
+                    f'mkdir -p "{remote_dir}" 2>/dev/null',
+                    read_timeout=SEND_CMD_TIMEOUT,
+                )
+                if self.persistent:
+                    self._created_remote_dirs.add(remote_dir)
 
             for i, local_file_str in enumerate(local_files, 1):
                 local_path = Path(local_file_str)
@@ -363,17 +772,17 @@ class SCPClient:
                 file_size = local_path.stat().st_size
 
                 try:
-                    scp_conn = SCPConn(conn)
                     try:
-                        scp_conn.scp_transfer_file(
+                        scp_session.get().scp_transfer_file(
                             source_file=str(local_path),
                             dest_file=remote_file,
                         )
-                    finally:
-                        scp_conn.close()
+                    except Exception:
+                        scp_session.reset()
+                        raise
 
                     if self.use_checksum:
-                        local_hash = calculate_local_sha256(local_path)
+                        local_hash = local_hashes.get(local_path)
                         remote_hash = calculate_remote_sha256(conn, remote_file)
                         if verify_checksum(local_hash, remote_hash):
                             checksum_result = f"SHA256: {local_hash}"
@@ -455,19 +864,26 @@ class SCPClient:
         Returns:
             None
         """
-        print(f"\n{'=' * 60}")
-        print(f"{direction} 完了サマリー")
-        print(f"{'=' * 60}")
-        print(f"総ファイル数: {total}  成功: {succeeded}  失敗: {failed}")
+        # 出力行はリストに集め、最後に 1 回だけ print する
+        separator = "=" * 60
+        lines = [
+            f"\n{separator}",
+            f"{direction} 完了サマリー",
+            separator,
+            f"総ファイル数: {total}  成功: {succeeded}  失敗: {failed}",
+        ]
 
         if failed > 0:
-            print("\n[失敗したファイル]")
-            for r in results:
-                if not r["success"]:
-                    file_key = "remote" if direction == "DOWNLOAD" else "local"
-                    print(f"  - {r.get(file_key, '?')}: {r['error']}")
+            file_key = "remote" if direction == "DOWNLOAD" else "local"
+            lines.append("\n[失敗したファイル]")
+            lines.extend(
+                f"  - {r.get(file_key, '?')}: {r['error']}"
+                for r in results
+                if not r["success"]
+            )
 
-        print(f"{'=' * 60}")
+        lines.append(separator)
+        print("\n".join(lines))
 
     def _display_jupyter_summary(
         self,
@@ -495,32 +911,31 @@ class SCPClient:
             self._display_cli_summary(results, direction, total, succeeded, failed)
             return
 
-        rows_html = ""
+        # 行ごとの HTML はリストに集め、最後に 1 回だけ連結する（文字列の再連結を避ける）
+        rows: list[str] = []
         for r in results:
-            status_label = "✓ 成功" if r["success"] else "✗ 失敗"
-            bg_color = "#d4edda" if r["success"] else "#f8d7da"
-            file_label = r.get("remote", r.get("local", ""))
-            error_label = r.get("error", "")
-            rows_html += (
+            status_label, bg_color = SUMMARY_ROW_STYLES[bool(r["success"])]
+            # ファイル名やエラーメッセージに含まれる <, & などはそのまま HTML に埋め込まない
+            file_label = html.escape(str(r.get("remote", r.get("local", ""))), quote=False)
+            error_label = html.escape(str(r.get("error", "")), quote=False)
+            rows.append(
                 f'<tr style="background-color:{bg_color};">'
                 f"<td>{file_label}</td>"
                 f"<td>{status_label}</td>"
                 f"<td>{error_label}</td>"
                 f"</tr>"
             )
+        rows_html = "".join(rows)
 
-        html = (
+        summary_html = (
             f"<h3>{direction} 完了サマリー</h3>"
             f"<p>総ファイル数: <b>{total}</b> | "
             f"成功: <b>{succeeded}</b> | 失敗: <b>{failed}</b></p>"
-            f'<table border="1" style="border-collapse:collapse;width:100%;">'
-            f'<thead><tr style="background-color:#343a40;color:white;">'
-            f"<th>ファイル</th><th>状態</th><th>エラー</th>"
-            f"</tr></thead>"
+            f"{SUMMARY_TABLE_HEAD}"
             f"<tbody>{rows_html}</tbody>"
-            f"</table>"
+            "</table>"
         )
-        display(HTML(html))
+        display(HTML(summary_html))
 
 
 if __name__ == "__main__":
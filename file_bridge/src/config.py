@@ -1,13 +1,20 @@
 """設定ファイルの読み込みとプロファイル管理モジュール。"""
 
+import functools
 import logging
 import os
+import sys
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Optional
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # libyaml が利用できない環境では純 Python 実装を使う
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_PORT = 22
@@ -15,9 +22,34 @@ DEFAULT_LOG_FILE = "transfer.log"
 DEFAULT_CONFIG_FILE = "config.yaml"
 DEFAULT_REMOTE_BASE = "~/"
 DEFAULT_LOCAL_BASE = "./"
+YAML_CACHE_SIZE = 8
+
+# Python 3.10 以降では dataclass に __slots__ を生成させ、インスタンスごとの __dict__ を省く
+_DATACLASS_OPTIONS: dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@functools.lru_cache(maxsize=YAML_CACHE_SIZE)
+def _load_yaml_cached(path: str, mtime_ns: int) -> dict[str, Any]:
+    """YAML ファイルを解析し、結果をパスと更新時刻をキーにキャッシュする。
+
+    ファイルが更新されると mtime_ns が変わるため、自動的に再解析される。
+    返す辞書はキャッシュと共有されるため、呼び出し側で変更しないこと。
 
+    Args:
+        path: YAML ファイルの絶対パス。
+        mtime_ns: ファイルの更新時刻（ナノ秒）。キャッシュキーとしてのみ使用する。
 
-@dataclass
+    Returns:
+        解析結果の辞書。空ファイルの場合は空辞書。
+
+    Raises:
+        yaml.YAMLError: YAML の解析に失敗した場合。
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class ServerProfile:
     """サーバー接続プロファイルを表すデータクラス。
 
@@ -44,7 +76,7 @@ class ServerProfile:
     checksum: bool = True
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class TransferConfig:
     """転送実行時の全設定をまとめたデータクラス。
 
@@ -117,8 +149,9 @@ class ConfigLoader:
                 f"config.yaml.example を参考に {self.config_path} を作成してください。"
             )
 
-        with open(self.config_path, "r", encoding="utf-8") as f:
-            raw: dict[str, Any] = yaml.safe_load(f) or {}
+        raw = _load_yaml_cached(
+            str(self.config_path.resolve()), self.config_path.stat().st_mtime_ns
+        )
 
         self._default_profile = raw.get("default_profile", "")
         profiles_data: dict[str, Any] = raw.get("profiles", {})
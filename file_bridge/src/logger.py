@@ -1,9 +1,12 @@
 """転送ログの管理モジュール。"""
 
 import logging
+import sys
+import threading
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import Any, TextIO
 
 _module_logger = logging.getLogger(__name__)
 
@@ -11,12 +14,18 @@ LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 DEFAULT_LOG_FILE = "transfer.log"
 FIELD_SEP = " | "
 
-SIZE_KB = 1024
-SIZE_MB = 1024 ** 2
-SIZE_GB = 1024 ** 3
+# Python 3.10 以降では TransferRecord に __slots__ を生成させる（転送ファイル数だけ生成されるため）
+_DATACLASS_OPTIONS: dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
+SIZE_UNITS = ("B", "KB", "MB", "GB")
 
-@dataclass
+# to_log_line 用のテンプレート（モジュール読み込み時に一度だけ組み立てる）
+_LOG_LINE_TEMPLATE = FIELD_SEP.join(
+    ("%s", "%-8s", "%s -> %s", "%s", "%s", "%s")
+)
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class TransferRecord:
     """転送ログの 1 レコードを表すデータクラス。
 
@@ -57,18 +66,15 @@ class TransferRecord:
             >>> "DOWNLOAD" in record.to_log_line()
             True
         """
-        timestamp_str = self.timestamp.strftime(LOG_DATE_FORMAT)
-        size_str = _format_file_size(self.file_size)
-        result_str = "SUCCESS" if self.success else "FAILED "
-        parts = [
-            timestamp_str,
-            self.direction.ljust(8),
-            f"{self.source_path} -> {self.dest_path}",
-            size_str,
-            result_str,
+        return _LOG_LINE_TEMPLATE % (
+            self.timestamp.strftime(LOG_DATE_FORMAT),
+            self.direction,
+            self.source_path,
+            self.dest_path,
+            _format_file_size(self.file_size),
+            "SUCCESS" if self.success else "FAILED ",
             self.checksum_result,
-        ]
-        return FIELD_SEP.join(parts)
+        )
 
 
 def _format_file_size(size_bytes: int) -> str:
@@ -86,24 +92,70 @@ def _format_file_size(size_bytes: int) -> str:
         >>> _format_file_size(1536)
         '1.5KB'
     """
-    if size_bytes < SIZE_KB:
+    # 1024 = 2**10 なので、ビット長から単位のインデックスを直接求める
+    unit_idx = min(max((size_bytes.bit_length() - 1) // 10, 0), len(SIZE_UNITS) - 1)
+    if unit_idx == 0:
         return f"{size_bytes}B"
-    elif size_bytes < SIZE_MB:
-        return f"{size_bytes / SIZE_KB:.1f}KB"
-    elif size_bytes < SIZE_GB:
-        return f"{size_bytes / SIZE_MB:.1f}MB"
-    else:
-        return f"{size_bytes / SIZE_GB:.1f}GB"
+    return f"{size_bytes / (1 << (10 * unit_idx)):.1f}{SIZE_UNITS[unit_idx]}"
+
+
+# 同じログファイルを指す TransferLogger 間で共有するファイルハンドル・書き込みロックと参照数。
+# 1 つのハンドルへそのファイル専用のロックを取って 1 行ずつ書き込み、行が混ざらないようにする。
+# _registry_lock はハンドルの取得・解放時のみ使い、書き込みでは取らない
+_shared_handles: dict[Path, tuple[TextIO, threading.Lock]] = {}
+_handle_refcounts: dict[Path, int] = {}
+_registry_lock = threading.Lock()
+
+
+def _acquire_handle(path: Path) -> tuple[TextIO, threading.Lock]:
+    """ログファイルの共有ハンドルを取得する（未オープンであれば開く）。
+
+    Args:
+        path: 解決済みのログファイルパス。
+
+    Returns:
+        追記モードで開いたファイルハンドルと、そのファイルへの書き込み用ロックのタプル。
+    """
+    with _registry_lock:
+        entry = _shared_handles.get(path)
+        if entry is None:
+            entry = (open(path, "a", encoding="utf-8"), threading.Lock())
+            _shared_handles[path] = entry
+            _handle_refcounts[path] = 0
+        _handle_refcounts[path] += 1
+        return entry
+
+
+def _release_handle(path: Path) -> None:
+    """共有ハンドルの参照を解放し、最後の参照であればファイルを閉じる。
+
+    Args:
+        path: 解決済みのログファイルパス。
+
+    Returns:
+        None
+    """
+    with _registry_lock:
+        _handle_refcounts[path] -= 1
+        if _handle_refcounts[path] == 0:
+            del _handle_refcounts[path]
+            fh, write_lock = _shared_handles.pop(path)
+            with write_lock:
+                fh.close()
 
 
 class TransferLogger:
     """転送ログの管理クラス。
 
-    ファイル転送の記録をログファイルと標準ロガーの両方に出力する。
+    ファイル転送の記録をログファイルに追記し、標準ロガーにもデバッグ出力する。
+    レコードは 1 行ずつ書き込んで即座に flush するため、プロセスが異常終了しても
+    記録済みの転送はログに残る。同じファイルを指すインスタンスはハンドルを共有し、
+    書き込みをロックで直列化するため行が混ざらない。
 
     Attributes:
         log_file: ログファイルのパス。
-        _file_logger: ファイル出力専用のロガー。
+        _fh: 同じログファイルを指すインスタンス間で共有するファイルハンドル。
+        _write_lock: _fh への書き込みを直列化するロック（同じファイルのインスタンス間で共有）。
 
     Examples:
         >>> tl = TransferLogger("./transfer.log")
@@ -116,6 +168,7 @@ class TransferLogger:
         ...     success=True,
         ... )
         >>> tl.log_transfer(record)
+        >>> tl.close()
     """
 
     def __init__(self, log_file: str = DEFAULT_LOG_FILE) -> None:
@@ -127,39 +180,41 @@ class TransferLogger:
         self.log_file = Path(log_file)
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
 
-        # ロガー名にパスを含めて複数インスタンスの競合を防ぐ
-        logger_name = f"transfer_file.{id(self)}"
-        self._file_logger = logging.getLogger(logger_name)
-        self._file_logger.setLevel(logging.INFO)
-        self._file_logger.propagate = False
-
-        if not self._file_logger.handlers:
-            handler = logging.FileHandler(self.log_file, encoding="utf-8")
-            handler.setFormatter(logging.Formatter("%(message)s"))
-            self._file_logger.addHandler(handler)
+        self._resolved_path = self.log_file.resolve()
+        self._fh, self._write_lock = _acquire_handle(self._resolved_path)
+        self._closed = False
 
     def log_transfer(self, record: TransferRecord) -> None:
         """転送レコードをログファイルに記録する。
 
+        close() 後に呼び出された場合は警告を出してレコードを破棄する。
+
         Args:
             record: 記録する TransferRecord インスタンス。
 
         Returns:
             None
         """
+        if self._closed:
+            _module_logger.warning("閉じた転送ログへの書き込みを無視しました: %s", self.log_file)
+            return
         log_line = record.to_log_line()
-        self._file_logger.info(log_line)
-        _module_logger.debug("転送ログ記録: %s", log_line)
+        # 行単位で書き込んで flush し、クラッシュ時にも記録済みの行を失わない
+        with self._write_lock:
+            self._fh.write(log_line + "\n")
+            self._fh.flush()
+        if _module_logger.isEnabledFor(logging.DEBUG):
+            _module_logger.debug("転送ログ記録: %s", log_line)
 
     def close(self) -> None:
-        """ログファイルハンドラを閉じる。
+        """ログファイルを閉じる。複数回呼び出しても安全。
 
         Returns:
             None
         """
-        for handler in self._file_logger.handlers[:]:
-            handler.close()
-            self._file_logger.removeHandler(handler)
+        if not self._closed:
+            self._closed = True
+            _release_handle(self._resolved_path)
 
 
 if __name__ == "__main__":
@@ -176,5 +231,6 @@ if __name__ == "__main__":
         checksum_result="SHA256: abc123def456...",
     )
     tl.log_transfer(record)
+    tl.close()
     print(f"ログを書き込みました: {tl.log_file}")
     print(f"ログ内容: {record.to_log_line()}")